@@ -11,22 +11,19 @@ Direct transformation of video analysis data into business process maps.
 """
 
 import asyncio
-import json
+import atexit
+import functools
 import logging
+import mmap
 import os
+import shutil
 import sys
-import webbrowser
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-import argparse
-import tempfile
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+import orjson
 
-from simple_process_mapper import generate_simple_process_map
 from process_mapper.process_models import ProcessMap
 
 # Setup logging
@@ -39,6 +36,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Placeholder in the visualizer template where the process map script is injected
+TEMPLATE_SENTINEL = "/*__PROCESS_MAP_INJECT__*/"
+
+# Seconds to wait for the browser to load the visualizer before exiting
+VISUALIZER_LOAD_DELAY_SECONDS = 3
+
+# Top-level keys every video analysis file must contain
+REQUIRED_INPUT_FIELDS = frozenset({"events", "transcripts", "process_summary"})
+
+
+@functools.lru_cache(maxsize=4)
+def _load_template_parts(template_path: str) -> tuple[str, str, bool]:
+    """Read a visualizer template once and split it around the sentinel.
+
+    Returns:
+        Tuple of (head, tail, sentinel_found)
+    """
+    template_content = Path(template_path).read_bytes().decode("utf-8")
+
+    head, sentinel, tail = template_content.partition(TEMPLATE_SENTINEL)
+    return head, tail, bool(sentinel)
+
 
 def print_banner():
     """Print application banner."""
@@ -70,42 +89,78 @@ def load_video_analysis_data(input_file: Path) -> dict:
 
     logger.info(f"Loading video analysis data from: {input_file}")
 
-    with open(input_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # Parse straight from the page cache without an intermediate file buffer
+    with open(input_file, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                data = orjson.loads(view)
 
     # Basic validation
-    required_fields = ["events", "transcripts", "process_summary"]
-    missing_fields = [field for field in required_fields if field not in data]
+    missing_fields = REQUIRED_INPUT_FIELDS - data.keys()
 
     if missing_fields:
-        raise ValueError(f"Missing required fields in input data: {missing_fields}")
+        raise ValueError(
+            f"Missing required fields in input data: {sorted(missing_fields)}"
+        )
 
     logger.info(f"Video analysis data loaded successfully")
     logger.info(
-        f'Events: {len(data.get("events", []))}, Transcripts: {len(data.get("transcripts", []))}'
+        f'Events: {len(data["events"])}, Transcripts: {len(data["transcripts"])}'
     )
 
     return data
 
 
-def save_process_map(process_map: ProcessMap, output_file: Path) -> None:
-    """Save process map to file."""
+def _dump_process_map(process_map: ProcessMap) -> bytes:
+    """Serialize a process map to indented JSON, omitting unset optional fields."""
+    return process_map.model_dump_json(indent=2, exclude_none=True).encode()
+
+
+def save_process_map(process_map: ProcessMap, output_file: Path) -> bytes:
+    """Save process map to file and return the serialized JSON bytes."""
 
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(process_map.model_dump(), f, indent=2, default=str)
+    process_map_json = _dump_process_map(process_map)
+    output_file.write_bytes(process_map_json)
 
     logger.info(f"Process map saved to: {output_file}")
     print(f"Process map saved to: {output_file}")
 
+    return process_map_json
+
+
+def _write_visualizer_file(head: str, injected_script: str, tail: str) -> str:
+    """Write the patched visualizer to a temporary HTML file and return its path.
+
+    The file lives in a temporary directory that is removed when the process exits.
+    """
+    import tempfile
+
+    temp_dir = tempfile.mkdtemp(prefix="process_map_")
+    atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
+
+    temp_path = os.path.join(temp_dir, "process_map_visualizer.html")
+    with open(temp_path, "w", encoding="utf-8") as temp_file:
+        temp_file.write(head)
+        temp_file.write(injected_script)
+        temp_file.write(tail)
+    return temp_path
+
 
 async def open_visualizer(
     process_map: ProcessMap,
     template_path: Optional[Path] = None,
     output_file: Optional[Path] = None,
+    process_map_json: Optional[bytes] = None,
 ) -> None:
-    """Open process map in browser visualizer."""
+    """Open process map in browser visualizer.
+
+    Pass the bytes returned by ``save_process_map`` as ``process_map_json``
+    to avoid dumping the process map a second time.
+    """
+
+    import webbrowser
 
     logger.info("Opening process map visualizer...")
 
@@ -119,79 +174,70 @@ async def open_visualizer(
         print(f"Visualizer template not found: {template_path}")
         return
 
-    # Read template
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
+    # Read template (cached per resolved path)
+    head, tail, sentinel_found = await asyncio.to_thread(
+        _load_template_parts, str(template_path.resolve())
+    )
 
     # Embed the JSON data directly into the template
-    process_map_json = json.dumps(process_map.model_dump(), indent=2)
+    if process_map_json is None:
+        process_map_json = _dump_process_map(process_map)
+    process_map_json = process_map_json.decode("utf-8")
     json_file_path = (
         output_file.resolve() if output_file else "generated_process_map.json"
     )
 
-    # Create a more robust data injection - replace the entire loadSampleData function
-    old_function = """        function loadSampleData() {
-            const sampleData = {"""
-
-    new_function = f"""        function loadSampleData() {{
-            // Auto-load generated process map data instead
-            const generatedProcessMap = {process_map_json};
-            
-            document.getElementById('jsonInput').value = JSON.stringify(generatedProcessMap, null, 2);
-            
-            // Automatically load the process map
-            setTimeout(() => {{
-                console.log('Auto-loading generated process map...');
-                loadProcessMap();
-                showMessage(`Process map auto-loaded: ${{generatedProcessMap.nodes.length}} nodes, ${{generatedProcessMap.edges.length}} edges`, 'success');
-            }}, 500);
-            
-            console.log('Generated from file: {json_file_path}');
-        }}
-
-        // Call loadSampleData automatically when page loads
-        window.addEventListener('DOMContentLoaded', () => {{
-            setTimeout(() => {{
-                loadSampleData();
-            }}, 1000);
-        }});
-
-        function loadOriginalSampleData() {{
-            const sampleData = {{"""
-
-    modified_template = template_content.replace(old_function, new_function)
+    # Inject the data at the template sentinel, overriding loadSampleData
+    injected_script = f"""// Auto-load generated process map data instead of the sample data
+      const generatedProcessMap = {process_map_json};
+
+      loadSampleData = function () {{
+        document.getElementById("jsonInput").value = JSON.stringify(generatedProcessMap, null, 2);
+
+        // Automatically load the process map
+        setTimeout(() => {{
+          console.log("Auto-loading generated process map...");
+          loadProcessMap();
+          showMessage(`Process map auto-loaded: ${{generatedProcessMap.nodes.length}} nodes, ${{generatedProcessMap.edges.length}} edges`, "success");
+        }}, 500);
+
+        console.log("Generated from file: {json_file_path}");
+      }};
+
+      // Call loadSampleData automatically when page loads
+      window.addEventListener("DOMContentLoaded", () => {{
+        setTimeout(() => {{
+          loadSampleData();
+        }}, 1000);
+      }});"""
+
+    if not sentinel_found:
+        logger.warning(
+            f"Template sentinel {TEMPLATE_SENTINEL} not found in {template_path}"
+        )
+        injected_script = ""
 
     # Create temporary file
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".html", delete=False, encoding="utf-8"
-    ) as temp_file:
-        temp_file.write(modified_template)
-        temp_path = temp_file.name
+    temp_path = await asyncio.to_thread(
+        _write_visualizer_file, head, injected_script, tail
+    )
 
-    try:
-        # Open in browser
-        webbrowser.open(f"file://{temp_path}")
-        logger.info("Process map visualizer opened in browser")
-        print("Process map visualizer opened in browser")
-        print(f"JSON data source: {json_file_path}")
-        print(f"Visualizer temp file: {temp_path}")
-        print("Press Enter when done viewing (to clean up temporary file)...")
-        input()
-
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_path)
-            logger.info("Cleaned up temporary visualizer file")
-        except Exception as e:
-            logger.warning(
-                f"Warning: Could not clean up temporary file {temp_path}: {e}"
-            )
+    # Open in browser
+    await asyncio.to_thread(webbrowser.open, f"file://{temp_path}")
+    logger.info("Process map visualizer opened in browser")
+    print("Process map visualizer opened in browser")
+    print(f"JSON data source: {json_file_path}")
+    print(f"Visualizer temp file: {temp_path}")
+
+    # Give the browser time to load the file before it is cleaned up on exit
+    await asyncio.sleep(VISUALIZER_LOAD_DELAY_SECONDS)
 
 
 async def main():
     """Main application entry point."""
 
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Process Mapper - Generate business process maps from video analysis",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -244,10 +290,24 @@ Environment Variables:
         "--template-path", type=Path, help="Path to custom visualizer template"
     )
 
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Summarize all process steps with a single Gemini request",
+    )
+
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
 
     args = parser.parse_args()
 
+    # CLI-only dependencies are imported here so helper imports stay light
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+
+    from simple_process_mapper import generate_simple_process_map_async
+
     # Setup logging level
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -275,10 +335,12 @@ Environment Variables:
         logger.info("Generating process map from video events...")
         print("Generating process map from video events...")
 
-        process_map = generate_simple_process_map(video_data)
+        process_map = await generate_simple_process_map_async(
+            video_data, batch=args.batch
+        )
 
         # Save process map
-        save_process_map(process_map, args.output)
+        process_map_json = save_process_map(process_map, args.output)
 
         # Print success summary
         print()
@@ -294,7 +356,9 @@ Environment Variables:
 
         # Open visualizer if requested
         if args.visualize:
-            await open_visualizer(process_map, args.template_path, args.output)
+            await open_visualizer(
+                process_map, args.template_path, args.output, process_map_json
+            )
 
         logger.info("Process mapping completed successfully")
         print("All done!")
@@ -4,7 +4,7 @@ Extended Pydantic models for agentic process mapping.
 
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
@@ -17,12 +17,23 @@ class ProcessStepType(str, Enum):
     OUTPUT = "output"
 
 
+class Position(BaseModel):
+    """X,Y coordinates of a process step in the visualizer."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    x: int = Field(description="Horizontal position")
+    y: int = Field(description="Vertical position")
+
+
 class ProcessStep(BaseModel):
     """A single step in the business process."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
     
     id: str = Field(description="Unique step identifier")
     type: ProcessStepType = Field(description="Type of process step")
-    position: Dict[str, int] = Field(description="X,Y coordinates for visualization")
+    position: Position = Field(description="X,Y coordinates for visualization")
     data: Dict[str, Any] = Field(description="Step data including label and description")
     timestamp_ms: Optional[int] = Field(None, description="Original timestamp from video")
     confidence_score: float = Field(ge=0, le=1, description="Confidence in this step mapping")
@@ -31,6 +42,8 @@ class ProcessStep(BaseModel):
 
 class ProcessEdge(BaseModel):
     """Connection between process steps."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
     
     id: str = Field(description="Unique edge identifier") 
     source: str = Field(description="Source step ID")
@@ -42,6 +55,8 @@ class ProcessEdge(BaseModel):
 
 class ProcessMap(BaseModel):
     """Complete business process map."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
     
     nodes: List[ProcessStep] = Field(description="All process steps")
     edges: List[ProcessEdge] = Field(description="All connections between steps")
@@ -50,6 +65,8 @@ class ProcessMap(BaseModel):
 
 class WorkflowAnalysis(BaseModel):
     """Analysis of the business workflow from video events."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
     
     workflow_type: Literal["sequential", "parallel", "conditional", "loop"] = Field(
         description="Type of workflow pattern detected"
@@ -78,6 +95,8 @@ class AgentState(BaseModel):
 
 class AgentAction(BaseModel):
     """Result of an agent action execution."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
     
     action: str = Field(description="Action that was executed")
     success: bool = Field(description="Whether action succeeded")
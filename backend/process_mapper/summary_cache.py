@@ -0,0 +1,85 @@
+"""
+Embedding-similarity cache for LLM step summaries.
+"""
+
+import math
+import operator
+import threading
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+import google.generativeai as genai
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+
+class SemanticCache:
+    """
+    In-memory cache that returns a stored LLM response when a new prompt key
+    is semantically close to one seen before.
+
+    Keys are embedded with the Gemini embedding API and compared by cosine
+    similarity against all stored entries. The scan is pure Python, so keep
+    max_entries small.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of stored entries (oldest evicted first)
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # (key embedding, value) pairs, oldest first
+        self._entries: Deque[Tuple[List[float], Any]] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], Optional[List[float]]]:
+        """
+        Find the cached value for the most similar stored key.
+
+        Returns:
+            Tuple of (cached value or None, key embedding or None if embedding
+            failed). Pass the embedding to ``add`` on a miss to avoid
+            embedding the key twice.
+        """
+        try:
+            vector = self._embed(key)
+        except Exception as e:
+            print(f"Semantic cache embedding failed: {e}")
+            return None, None
+
+        # Scan a snapshot so concurrent adds cannot shift entries mid-search
+        with self._lock:
+            entries = list(self._entries)
+
+        best_score = 0.0
+        best_value = None
+        for stored, value in entries:
+            score = sum(map(operator.mul, vector, stored))
+            if score > best_score:
+                best_score = score
+                best_value = value
+
+        if best_value is not None and best_score >= self.threshold:
+            return best_value, vector
+        return None, vector
+
+    def add(self, vector: Optional[List[float]], value: Any) -> None:
+        """Store a value under a key embedding returned by ``lookup``."""
+        if vector is None or not value:
+            return
+
+        # The deque evicts the oldest entry once max_entries is reached
+        with self._lock:
+            self._entries.append((vector, value))
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed text and L2-normalize it so dot product equals cosine similarity."""
+        result = genai.embed_content(model=EMBEDDING_MODEL, content=text)
+        vector = result["embedding"]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
@@ -7,77 +7,332 @@ Direct, straightforward transformation from events to visual workflow.
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from video_processing.models import VideoEvent, ToolIdentification, EventType
+from video_processing.gemini_client import configure_gemini
 
+from process_mapper.summary_cache import SemanticCache
 from process_mapper.process_models import (
+    Position,
     ProcessMap,
     ProcessStep,
     ProcessEdge,
     ProcessStepType,
 )
+import asyncio
+import functools
+import itertools
+import orjson
 import os
 import google.generativeai as genai
+from pydantic import TypeAdapter, ValidationError
 
+# Maximum number of memoized LLM responses per prompt type
+LLM_CACHE_SIZE = 4096
+
+# Maximum number of concurrent Gemini requests while building a process map
+LLM_MAX_CONCURRENCY = 8
+
+# Maximum number of step embeddings compared on each semantic cache lookup
+SEMANTIC_CACHE_SIZE = 256
+
+# Near-duplicate step prompts reuse earlier responses above this similarity
+_STEP_CACHE = SemanticCache(threshold=0.95, max_entries=SEMANTIC_CACHE_SIZE)
+
+# Exact-match LLM responses keyed on the inputs their prompts are built from
+_STEP_RESULTS: Dict[tuple[str, str, str], tuple[str, str]] = {}
+_TITLE_RESULTS: Dict[tuple[str, str, str, str], str] = {}
+
+# Validates a whole list of event dictionaries in one call
+_EVENT_LIST_ADAPTER = TypeAdapter(List[VideoEvent])
+
+# EventType members by value, for lookups without the Enum call protocol
+_EVENT_TYPES = EventType._value2member_map_
+
+# Minimum number of steps before batch mode sends a single combined request
+BATCH_MIN_STEPS = 5
+
+# Smaller workflows (or single-tool ones) use the fallback title without an LLM call
+PROCESS_TITLE_LLM_MIN_STEPS = int(os.getenv("PROCESS_TITLE_LLM_MIN_STEPS", "4"))
+
+# Prompt templates: stable instructions first, step/workflow data last so the
+# shared prefix stays cacheable
+STEP_SUMMARY_PROMPT = """
+Summarize the business process step below and return an object with:
+
+- "title": 2-4 words that capture the main action, as a concise business
+  action phrase like "Read email", "Search LinkedIn", "Create contact" or
+  "Login to system"
+- "detailed": a 2-3 sentence description that explains what the user accomplished:
+  - Start with "User [action]..."
+  - Focus on the business purpose/outcome
+  - Mention key details like what they clicked, searched for, or created
+  - Keep it professional and clear
+
+Example detailed description: "User receives inquiry email about mapping solution, clicks to open and reads content to understand the business opportunity and client requirements."
+
+Tool: {tool}
+Action: {action}
+User Actions:
+{events}
+"""
+
+BATCH_SUMMARY_PROMPT = """
+For each numbered business process step below, return an object with:
+- "title": a concise 2-4 word business action phrase (e.g. "Read email", "Search LinkedIn")
+- "description": a 2-3 sentence description starting with "User [action]..." that explains
+  what the user accomplished and the business purpose
+
+Return exactly one object per step, in the same order.
+
+Steps:
+{steps}
+"""
+
+PROCESS_TITLE_PROMPT = """
+Generate a concise business process title (4-8 words) for the workflow below.
+
+Focus on the main business objective. Examples:
+- "Customer Inquiry to Deal Creation"
+- "Email Processing and Contact Management"
+- "Lead Research and CRM Update"
+- "Support Ticket Resolution Process"
+
+Return only the title, nothing else.
+
+Tools used: {tools}
+Workflow: {first_tool} → ... → {last_tool}
+Sample actions: {actions}
+"""
+
+
+def _remember(cache: Dict[Any, Any], key: Any, value: Any) -> None:
+    """Store an LLM response, evicting the oldest entry when the cache is full."""
+    if len(cache) >= LLM_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
+@functools.lru_cache(maxsize=1)
+def _gemini_model() -> genai.GenerativeModel:
+    """Configure Gemini once and return the shared summarization model."""
+    configure_gemini(os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(
+        "gemini-1.5-flash"
+    )  # Use faster model for simple summarization
+
+
+async def _summarize_step(
+    descriptions: List[str], tool_name: str, semaphore: asyncio.Semaphore
+) -> tuple[str, str]:
+    """
+    Use LLM to create both the short task title and the detailed description
+    of a workflow step in a single request.
+
+    Returns:
+        Tuple of (task_title, detailed_description)
+    """
+    raw_description = _create_step_description(descriptions)
+    fallback_title = (
+        raw_description[:40] + "..." if len(raw_description) > 40 else raw_description
+    )
 
-def _summarize_step_description(raw_description: str, tool_name: str) -> str:
-    """Use LLM to create a concise summary of the workflow step."""
     try:
         # Initialize Gemini if API key is available
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             # Fallback to simple truncation if no API key
-            return (
-                raw_description[:40] + "..."
-                if len(raw_description) > 40
-                else raw_description
+            return fallback_title, _create_fallback_detailed_description(
+                descriptions, tool_name
             )
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(
-            "gemini-1.5-flash"
-        )  # Use faster model for simple summarization
-
-        prompt = f"""
-        Summarize this workflow step in 2-4 words that capture the main action:
-        
-        Tool: {tool_name}
-        Action: {raw_description}
-        
-        Provide a concise business action phrase like:
-        - "Read email"
-        - "Search LinkedIn" 
-        - "Create contact"
-        - "Login to system"
-        
-        Return only the short phrase, nothing else.
-        """
-
-        response = model.generate_content(prompt)
-        summary = response.text.strip()
-
-        # Clean up the response (remove quotes, extra text)
-        summary = summary.replace('"', "").replace("'", "").strip()
-        if len(summary) > 25:  # If still too long, truncate
-            summary = summary[:22] + "..."
-
-        return summary or "Process step"
+        # Gather event details
+        event_details = []
+        for description in descriptions[:5]:  # Limit to 5 events to avoid token limits
+            if description:
+                event_details.append(f"- {description}")
 
-    except Exception as e:
-        print(f"LLM summarization failed: {e}")
-        # Fallback to simple truncation
+        event_text = (
+            "\n".join(event_details) if event_details else "User performed actions"
+        )
+
+        task_title, detailed_desc = await _summarize_step_cached(
+            tool_name, raw_description, event_text, semaphore
+        )
         return (
-            raw_description[:40] + "..."
-            if len(raw_description) > 40
-            else raw_description
+            task_title or "Process step",
+            detailed_desc
+            or _create_fallback_detailed_description(descriptions, tool_name),
         )
 
+    except Exception as e:
+        print(f"LLM step summarization failed: {e}")
+        return fallback_title, _create_fallback_detailed_description(
+            descriptions, tool_name
+        )
+
+
+async def _summarize_step_cached(
+    tool_name: str,
+    raw_description: str,
+    event_text: str,
+    semaphore: asyncio.Semaphore,
+) -> tuple[str, str]:
+    """LLM (title, detailed description) for a step, memoized on its inputs."""
+    key = (tool_name, raw_description, event_text)
+    if key in _STEP_RESULTS:
+        return _STEP_RESULTS[key]
+
+    model = _gemini_model()
+
+    # Embedding lookups run outside the semaphore so they don't hold up the
+    # slots reserved for generation requests
+    cached, key_vector = await asyncio.to_thread(
+        _STEP_CACHE.lookup, f"{tool_name}|{raw_description}|{event_text}"
+    )
+    if cached is not None:
+        _remember(_STEP_RESULTS, key, cached)
+        return cached
+
+    async with semaphore:
+        prompt = STEP_SUMMARY_PROMPT.format(
+            tool=tool_name, action=raw_description, events=event_text
+        )
+
+        response = await model.generate_content_async(
+            prompt,
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "detailed": {"type": "string"},
+                    },
+                    "required": ["title", "detailed"],
+                },
+            },
+        )
+    result = orjson.loads(response.text)
+
+    # Clean up the response (remove quotes, extra text)
+    summary = result.get("title", "").replace('"', "").replace("'", "").strip()
+    if len(summary) > 25:  # If still too long, truncate
+        summary = summary[:22] + "..."
+
+    detailed_desc = result.get("detailed", "").replace('"', "").replace("'", "").strip()
+    if len(detailed_desc) > 200:  # Reasonable limit
+        detailed_desc = detailed_desc[:197] + "..."
+
+    _STEP_CACHE.add(key_vector, (summary, detailed_desc))
+    _remember(_STEP_RESULTS, key, (summary, detailed_desc))
+    return summary, detailed_desc
+
+
+async def _summarize_steps_batch(
+    steps: List[tuple[str, List[str]]],
+) -> Optional[List[tuple[str, str]]]:
+    """
+    Summarize every workflow step with a single LLM request.
+
+    Args:
+        steps: (tool_name, event descriptions) per workflow step
+
+    Returns:
+        List of (task_title, detailed_description) per step, or None if the
+        batch request is unavailable or fails so callers can fall back to
+        per-step requests.
+    """
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return None
+
+    try:
+        model = _gemini_model()
+
+        step_lines = []
+        for i, (tool_name, descriptions) in enumerate(steps, 1):
+            actions = "; ".join(d for d in descriptions[:5] if d)
+            step_lines.append(f"{i}. Tool: {tool_name} | Actions: {actions}")
+        steps_text = "\n".join(step_lines)
+
+        prompt = BATCH_SUMMARY_PROMPT.format(steps=steps_text)
+
+        response = await model.generate_content_async(
+            prompt,
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": {"type": "string"},
+                            "description": {"type": "string"},
+                        },
+                        "required": ["title", "description"],
+                    },
+                },
+            },
+        )
+        results = orjson.loads(response.text)
+
+        if len(results) != len(steps):
+            print(
+                f"LLM batch summarization returned {len(results)} steps, "
+                f"expected {len(steps)}"
+            )
+            return None
+
+        summaries = []
+        for (tool_name, descriptions), result in zip(steps, results):
+            title = result.get("title", "").replace('"', "").replace("'", "").strip()
+            if len(title) > 25:
+                title = title[:22] + "..."
+
+            detailed = (
+                result.get("description", "").replace('"', "").replace("'", "").strip()
+            )
+            if len(detailed) > 200:
+                detailed = detailed[:197] + "..."
+
+            summaries.append(
+                (
+                    title or "Process step",
+                    detailed
+                    or _create_fallback_detailed_description(descriptions, tool_name),
+                )
+            )
+
+        return summaries
+
+    except Exception as e:
+        print(f"LLM batch summarization failed: {e}")
+        return None
+
+
+def create_process_map_from_events(
+    events: List[VideoEvent], batch: bool = False, now_iso: Optional[str] = None
+) -> ProcessMap:
+    """Synchronous wrapper around ``create_process_map_from_events_async``."""
+    return asyncio.run(
+        create_process_map_from_events_async(events, batch=batch, now_iso=now_iso)
+    )
+
 
-def create_process_map_from_events(events: List[VideoEvent]) -> ProcessMap:
+async def create_process_map_from_events_async(
+    events: List[VideoEvent], batch: bool = False, now_iso: Optional[str] = None
+) -> ProcessMap:
     """
     Convert a list of VideoEvent objects into a ProcessMap.
     Simple, direct transformation without agents or complex reasoning.
 
+    Per-step LLM requests and the process title request run concurrently,
+    bounded by LLM_MAX_CONCURRENCY.
+
     Args:
         events: List of VideoEvent objects from video analysis
+        batch: Summarize all steps with a single LLM request instead of
+            per-step requests (falls back to per-step for small maps)
+        now_iso: Generation timestamp for the metadata (defaults to now)
 
     Returns:
         ProcessMap: Visual workflow representation
@@ -90,39 +345,77 @@ def create_process_map_from_events(events: List[VideoEvent]) -> ProcessMap:
 
     # Group events by workflow steps to create logical steps
     tool_sequences = _group_events_by_workflow_steps(events)
+    unique_tools = list(set(tool_name for tool_name, _ in tool_sequences))
+
+    # Read per-event fields once; step helpers work on these plain lists
+    descriptions = [e.description or "" for e in events]
+    confidences = [e.confidence_score for e in events]
+    timestamps = [e.timestamp_ms or 0 for e in events]
+    event_types = [e.event_type.value if e.event_type else None for e in events]
+    tool_names = [e.tool_name or "Unknown" for e in events]
+
+    # Steps are consecutive runs of events, so each one is a slice [start, end)
+    bounds = list(
+        itertools.accumulate((len(group) for _, group in tool_sequences), initial=0)
+    )
+    step_ranges = list(itertools.pairwise(bounds))
+    steps = [
+        (tool_name, descriptions[start:end])
+        for (tool_name, _), (start, end) in zip(tool_sequences, step_ranges)
+    ]
+
+    # Generate process title based on workflow alongside the step summaries
+    semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    title_task = asyncio.ensure_future(
+        _generate_process_title(steps, unique_tools, semaphore)
+    )
+
+    # Summarize all steps at once in batch mode
+    summaries = None
+    if batch and len(steps) >= BATCH_MIN_STEPS:
+        summaries = await _summarize_steps_batch(steps)
+
+    if summaries is None:
+        # Task title and detailed action sequence from one LLM request per step
+        summaries = await asyncio.gather(
+            *(
+                _summarize_step(step_descriptions, tool_name, semaphore)
+                for tool_name, step_descriptions in steps
+            )
+        )
+
+    process_title = await title_task
 
     # Create nodes from tool sequences
     y_position = 50
     prev_node_id = None
 
-    for i, (tool_name, tool_events) in enumerate(tool_sequences):
+    for i, (tool_name, _) in enumerate(tool_sequences):
         node_id = f"step_{i+1}"
+        start, end = step_ranges[i]
 
         # Determine step type based on event types and position
-        step_type = _determine_step_type(tool_events, i, len(tool_sequences))
-
-        # Create description from events - use LLM summarization for task title
-        raw_description = _create_step_description(tool_events)
-        task_title = _summarize_step_description(raw_description, tool_name)
+        step_type = _determine_step_type(event_types[start:end], i, len(tool_sequences))
 
-        # Create detailed description showing user action sequence
-        detailed_description = _create_detailed_description(tool_events, tool_name)
+        task_title, detailed_description = summaries[i]
 
         # Get timestamp from first event in the sequence
-        timestamp_ms = tool_events[0].timestamp_ms if tool_events[0].timestamp_ms else 0
+        timestamp_ms = timestamps[start]
 
         # Create process step with new structure: Task as label, Tool below
-        node = ProcessStep(
+        # (fields are built here, so pydantic validation is skipped)
+        node = ProcessStep.model_construct(
             id=node_id,
             type=step_type,
-            position={"x": 200, "y": y_position},
+            position=Position.model_construct(x=200, y=y_position),
             data={
                 "label": task_title,  # Task as headline
                 "description": detailed_description,  # Detailed sequence
                 "tool": tool_name,  # Tool used
+                "occurrences": end - start,  # Repeats merged into this step
             },
             timestamp_ms=timestamp_ms,
-            confidence_score=_calculate_average_confidence(tool_events),
+            confidence_score=_calculate_average_confidence(confidences[start:end]),
             tool_context=tool_name,
         )
 
@@ -130,13 +423,13 @@ def create_process_map_from_events(events: List[VideoEvent]) -> ProcessMap:
 
         # Create edge from previous node (ALWAYS create an edge if there's a previous node)
         if prev_node_id:
-            edge = ProcessEdge(
+            edge = ProcessEdge.model_construct(
                 id=f"edge_{prev_node_id}_to_{node_id}",
                 source=prev_node_id,
                 target=node_id,
                 animated=True,
                 label=_create_transition_label(
-                    tool_sequences[i - 1][1] if i > 0 else [], tool_events
+                    tool_names[step_ranges[i - 1][0]], tool_names[start]
                 ),
             )
             edges.append(edge)
@@ -144,103 +437,55 @@ def create_process_map_from_events(events: List[VideoEvent]) -> ProcessMap:
         prev_node_id = node_id
         y_position += 250
 
-    # Ensure we have edges connecting all nodes (safety check)
-    if len(nodes) > 1 and len(edges) != len(nodes) - 1:
-        # Fix missing edges
-        for i in range(len(nodes) - 1):
-            edge_exists = any(
-                e.source == nodes[i].id and e.target == nodes[i + 1].id for e in edges
-            )
-            if not edge_exists:
-                edge = ProcessEdge(
-                    id=f"edge_fix_{i}",
-                    source=nodes[i].id,
-                    target=nodes[i + 1].id,
-                    animated=True,
-                    label="Continue",
-                )
-                edges.append(edge)
-
     # Calculate metadata with process title
     total_duration = (
         events[-1].timestamp_ms - events[0].timestamp_ms if len(events) > 1 else 0
     )
-    unique_tools = list(set(tool_name for tool_name, _ in tool_sequences))
-
-    # Generate process title based on workflow
-    process_title = _generate_process_title(tool_sequences, unique_tools)
 
     metadata = {
         "title": process_title,
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": now_iso or datetime.now().isoformat(),
         "total_events": len(events),
         "unique_tools": len(unique_tools),
         "tools": unique_tools,
         "total_duration_ms": total_duration,
         "confidence": (
-            sum(e.confidence_score or 0.8 for e in events) / len(events)
-            if events
-            else 0.8
+            sum(c or 0.8 for c in confidences) / len(events) if events else 0.8
         ),
     }
 
-    return ProcessMap(nodes=nodes, edges=edges, metadata=metadata)
+    return ProcessMap.model_construct(nodes=nodes, edges=edges, metadata=metadata)
 
 
 def _group_events_by_workflow_steps(
     events: List[VideoEvent],
 ) -> List[tuple[str, List[VideoEvent]]]:
-    """Create one step per event without any grouping or filtering."""
+    """
+    Create one step per run of consecutive identical events (same tool and action).
+
+    Returns (tool name, events) pairs in event order. Events match when their
+    tool names are equal and their descriptions match ignoring case and
+    surrounding whitespace; events without a tool count as "Unknown Tool". Identical events
+    that are not adjacent start a new step.
+    """
     if not events:
         return []
 
-    sequences = []
-    
-    # Convert each event to its own step without any grouping or filtering
-    for event in events:
-        tool_name = (
-            event.tool.name if event.tool and event.tool.name else "Unknown Tool"
-        )
-        # Each event becomes its own individual step
-        sequences.append((tool_name, [event]))
-    
-    return sequences
-
+    def step_key(event: VideoEvent) -> tuple[str, str]:
+        description = (event.description or "").strip().lower()
+        return event.tool_name or "Unknown Tool", description
 
-def _is_simple_app_switch(description: str) -> bool:
-    """No longer filtering app switches - always return False to keep all events."""
-    # Removed filtering logic - keep all events
-    return False
-
-
-def _is_new_logical_step(current_events: List[VideoEvent], new_event: VideoEvent) -> bool:
-    """No longer determining logical steps - always return True for individual events."""
-    # Removed logical step detection - each event is its own step
-    return True
-
-
-def _has_meaningful_content(events: List[VideoEvent]) -> bool:
-    """No longer filtering by meaningful content - always return True."""
-    # Removed content filtering - all events are considered meaningful
-    return True
-
-
-def _split_into_distinct_actions(tool: str, events: List[VideoEvent]) -> List[tuple[str, List[VideoEvent]]]:
-    """No splitting - return each event as its own action."""
-    # No splitting logic - each event becomes its own action
-    return [(tool, [event]) for event in events]
-
-
-def _are_similar_actions(event1: VideoEvent, event2: VideoEvent) -> bool:
-    """No longer grouping similar actions - always return False."""
-    # Removed similarity logic - each event is treated as distinct
-    return False
+    # Repeated consecutive actions collapse into a single step
+    return [
+        (tool_name, list(group))
+        for (tool_name, _), group in itertools.groupby(events, key=step_key)
+    ]
 
 
 def _determine_step_type(
-    events: List[VideoEvent], position: int, total_steps: int
+    event_types: List[Optional[str]], position: int, total_steps: int
 ) -> ProcessStepType:
-    """Determine the type of process step based on events and position."""
+    """Determine the type of process step based on its event types and position."""
 
     # First step is usually a trigger
     if position == 0:
@@ -251,8 +496,6 @@ def _determine_step_type(
         return ProcessStepType.OUTPUT
 
     # Look at event types to determine step type
-    event_types = [str(e.event_type) for e in events if e.event_type]
-
     if "USER_ACTION" in event_types:
         return ProcessStepType.PROCESS
     elif "APPLICATION_SWITCH" in event_types:
@@ -261,98 +504,41 @@ def _determine_step_type(
         return ProcessStepType.PROCESS
 
 
-def _create_step_description(events: List[VideoEvent]) -> str:
-    """Create a description for a step based on its events."""
-    if not events:
+def _create_step_description(descriptions: List[str]) -> str:
+    """Create a description for a step based on its event descriptions."""
+    if not descriptions:
         return "No description available"
 
     # Take up to 3 most descriptive events
-    descriptions = []
-    for event in events[:3]:
-        if event.description and len(event.description.strip()) > 10:
+    selected = []
+    for description in descriptions[:3]:
+        desc = description.strip()
+        if len(desc) > 10:
             # Truncate long descriptions
-            desc = event.description.strip()
             if len(desc) > 60:
                 desc = desc[:57] + "..."
-            descriptions.append(desc)
+            selected.append(desc)
 
-    if not descriptions:
+    if not selected:
         return "Process step"
 
-    if len(descriptions) == 1:
-        return descriptions[0]
+    if len(selected) == 1:
+        return selected[0]
 
     # Combine multiple descriptions
-    return "; ".join(descriptions)
-
-
-def _create_detailed_description(events: List[VideoEvent], tool_name: str) -> str:
-    """Create a detailed description showing user action sequence."""
-    if not events:
-        return "No actions recorded"
-
-    try:
-        # Use LLM to create a detailed workflow description
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            return _create_fallback_detailed_description(events, tool_name)
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-
-        # Gather event details
-        event_details = []
-        for event in events[:5]:  # Limit to 5 events to avoid token limits
-            if event.description:
-                event_details.append(f"- {event.description}")
-
-        event_text = (
-            "\n".join(event_details) if event_details else "User performed actions"
-        )
-
-        prompt = f"""
-        Create a detailed workflow description for this business process step:
-        
-        Tool: {tool_name}
-        User Actions:
-        {event_text}
-        
-        Write a 2-3 sentence description that explains what the user accomplished:
-        - Start with "User [action]..."
-        - Focus on the business purpose/outcome
-        - Mention key details like what they clicked, searched for, or created
-        - Keep it professional and clear
-        
-        Example: "User receives inquiry email about mapping solution, clicks to open and reads content to understand the business opportunity and client requirements."
-        
-        Return only the description, nothing else.
-        """
-
-        response = model.generate_content(prompt)
-        detailed_desc = response.text.strip()
-
-        # Clean up the response
-        detailed_desc = detailed_desc.replace('"', "").replace("'", "").strip()
-        if len(detailed_desc) > 200:  # Reasonable limit
-            detailed_desc = detailed_desc[:197] + "..."
-
-        return detailed_desc or _create_fallback_detailed_description(events, tool_name)
-
-    except Exception as e:
-        print(f"LLM detailed description failed: {e}")
-        return _create_fallback_detailed_description(events, tool_name)
+    return "; ".join(selected)
 
 
 def _create_fallback_detailed_description(
-    events: List[VideoEvent], tool_name: str
+    descriptions: List[str], tool_name: str
 ) -> str:
     """Create detailed description without LLM."""
-    if not events:
+    if not descriptions:
         return "No actions recorded"
 
     # Count action types
-    action_count = len(events)
-    unique_descriptions = list(set(e.description for e in events if e.description))[:3]
+    action_count = len(descriptions)
+    unique_descriptions = list(set(d for d in descriptions if d))[:3]
 
     if unique_descriptions:
         actions = ", ".join(unique_descriptions)
@@ -361,57 +547,39 @@ def _create_fallback_detailed_description(
         return f"User performed {action_count} actions in {tool_name}"
 
 
-def _generate_process_title(
-    tool_sequences: List[tuple[str, List[VideoEvent]]], unique_tools: List[str]
+async def _generate_process_title(
+    steps: List[tuple[str, List[str]]],
+    unique_tools: List[str],
+    semaphore: asyncio.Semaphore,
 ) -> str:
     """Generate a descriptive title for the process map."""
+    # Not worth an LLM round-trip for tiny workflows
+    if len(steps) < PROCESS_TITLE_LLM_MIN_STEPS or len(unique_tools) < 2:
+        return _create_fallback_process_title(unique_tools)
+
     try:
         # Use LLM to create a smart process title
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             return _create_fallback_process_title(unique_tools)
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-
         # Get first and last tools for workflow context
-        first_tool = tool_sequences[0][0] if tool_sequences else "Unknown"
-        last_tool = tool_sequences[-1][0] if tool_sequences else "Unknown"
+        first_tool = steps[0][0] if steps else "Unknown"
+        last_tool = steps[-1][0] if steps else "Unknown"
         tools_list = ", ".join(unique_tools)
 
         # Get some sample actions for context
         sample_actions = []
-        for tool_name, events in tool_sequences[:3]:  # First 3 sequences
-            for event in events[:2]:  # First 2 events per sequence
-                if event.description:
-                    sample_actions.append(f"{tool_name}: {event.description}")
+        for tool_name, descriptions in steps[:3]:  # First 3 sequences
+            for description in descriptions[:2]:  # First 2 events per sequence
+                if description:
+                    sample_actions.append(f"{tool_name}: {description}")
 
         actions_context = "; ".join(sample_actions)
 
-        prompt = f"""
-        Generate a concise business process title (4-8 words) for this workflow:
-        
-        Tools used: {tools_list}
-        Workflow: {first_tool} → ... → {last_tool}
-        Sample actions: {actions_context}
-        
-        Focus on the main business objective. Examples:
-        - "Customer Inquiry to Deal Creation"
-        - "Email Processing and Contact Management"
-        - "Lead Research and CRM Update"
-        - "Support Ticket Resolution Process"
-        
-        Return only the title, nothing else.
-        """
-
-        response = model.generate_content(prompt)
-        title = response.text.strip()
-
-        # Clean up the response
-        title = title.replace('"', "").replace("'", "").strip()
-        if len(title) > 50:  # Reasonable limit
-            title = title[:47] + "..."
-
+        title = await _title_cached(
+            tools_list, first_tool, last_tool, actions_context, semaphore
+        )
         return title or _create_fallback_process_title(unique_tools)
 
     except Exception as e:
@@ -419,6 +587,40 @@ def _generate_process_title(
         return _create_fallback_process_title(unique_tools)
 
 
+async def _title_cached(
+    tools_list: str,
+    first_tool: str,
+    last_tool: str,
+    actions_context: str,
+    semaphore: asyncio.Semaphore,
+) -> str:
+    """LLM process title, memoized on the workflow context it is built from."""
+    key = (tools_list, first_tool, last_tool, actions_context)
+    if key in _TITLE_RESULTS:
+        return _TITLE_RESULTS[key]
+
+    model = _gemini_model()
+
+    prompt = PROCESS_TITLE_PROMPT.format(
+        tools=tools_list,
+        first_tool=first_tool,
+        last_tool=last_tool,
+        actions=actions_context,
+    )
+
+    async with semaphore:
+        response = await model.generate_content_async(prompt)
+    title = response.text.strip()
+
+    # Clean up the response
+    title = title.replace('"', "").replace("'", "").strip()
+    if len(title) > 50:  # Reasonable limit
+        title = title[:47] + "..."
+
+    _remember(_TITLE_RESULTS, key, title)
+    return title
+
+
 def _create_fallback_process_title(unique_tools: List[str]) -> str:
     """Create process title without LLM."""
     if not unique_tools:
@@ -432,85 +634,104 @@ def _create_fallback_process_title(unique_tools: List[str]) -> str:
         return f"Multi-Application Process ({len(unique_tools)} tools)"
 
 
-def _create_transition_label(
-    prev_events: List[VideoEvent], current_events: List[VideoEvent]
-) -> str:
-    """Create a label for the transition between steps."""
+def _create_transition_label(prev_tool: str, current_tool: str) -> str:
+    """Create a label for the transition between steps from their first events' tools."""
     # Simple transition based on application switch
-    prev_tool = (
-        prev_events[0].tool.name if prev_events and prev_events[0].tool else "Unknown"
-    )
-    current_tool = (
-        current_events[0].tool.name
-        if current_events and current_events[0].tool
-        else "Unknown"
-    )
-
     if prev_tool != current_tool:
         return f"Switch to {current_tool}"
     else:
         return "Continue"
 
 
-def _calculate_average_confidence(events: List[VideoEvent]) -> float:
+def _calculate_average_confidence(confidences: List[Optional[float]]) -> float:
     """Calculate average confidence score for a group of events."""
-    scores = [e.confidence_score for e in events if e.confidence_score is not None]
+    scores = [c for c in confidences if c is not None]
     if not scores:
         return 0.8  # Default confidence
     return sum(scores) / len(scores)
 
 
+def _video_event_from_dict(event_data: Dict[str, Any]) -> VideoEvent:
+    """Build a VideoEvent from a possibly incomplete event dictionary."""
+    get = event_data.get
+
+    tool = None
+    tool_data = get("tool")
+    if tool_data:
+        tool_get = tool_data.get
+        tool = ToolIdentification(
+            name=tool_get("name", "Unknown"),
+            type=tool_get("type"),
+            url=tool_get("url"),
+            version=tool_get("version"),
+        )
+
+    event_type = get("event_type")
+    return VideoEvent(
+        timestamp_ms=get("timestamp_ms"),
+        event_type=_EVENT_TYPES.get(event_type) if event_type else None,
+        tool=tool,
+        description=get("description", ""),
+        confidence_score=get("confidence_score", 0.8),
+    )
+
+
 # Simple function to replace the complex orchestrator
-def generate_simple_process_map(video_data: Dict[str, Any]) -> ProcessMap:
+def generate_simple_process_map(
+    video_data: Dict[str, Any], batch: bool = False
+) -> ProcessMap:
+    """Synchronous wrapper around ``generate_simple_process_map_async``."""
+    return asyncio.run(generate_simple_process_map_async(video_data, batch=batch))
+
+
+async def generate_simple_process_map_async(
+    video_data: Dict[str, Any], batch: bool = False
+) -> ProcessMap:
     """
     Main entry point - replace the complex agentic orchestrator with this simple function.
 
     Args:
         video_data: Video analysis data with events
+        batch: Summarize all steps with a single LLM request
 
     Returns:
         ProcessMap: Generated process map
     """
     events = video_data.get("events", [])
+    now_iso = datetime.now().isoformat()
 
     if not events:
         return ProcessMap(
             nodes=[],
             edges=[],
             metadata={
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": now_iso,
                 "error": "No events found in video data",
             },
         )
 
     # Convert events to VideoEvent objects if they aren't already
     if events and not isinstance(events[0], VideoEvent):
-        # They're likely dictionaries, convert them
-        video_events = []
-        for event_data in events:
-            if isinstance(event_data, dict):
-
-                tool = None
-                if event_data.get("tool"):
-                    tool = ToolIdentification(
-                        name=event_data["tool"].get("name", "Unknown"),
-                        type=event_data["tool"].get("type"),
-                        url=event_data["tool"].get("url"),
-                        version=event_data["tool"].get("version"),
-                    )
-
-                event = VideoEvent(
-                    timestamp_ms=event_data.get("timestamp_ms"),
-                    event_type=(
-                        EventType(event_data["event_type"])
-                        if event_data.get("event_type")
-                        else None
-                    ),
-                    tool=tool,
-                    description=event_data.get("description", ""),
-                    confidence_score=event_data.get("confidence_score", 0.8),
-                )
-                video_events.append(event)
-        events = video_events
-
-    return create_process_map_from_events(events)
+        # They're likely dictionaries, validate them all in one call
+        try:
+            validated = _EVENT_LIST_ADAPTER.validate_python(events)
+            # Events without a confidence_score key count as 0.8, as in the
+            # lenient path below, so they still weigh into step confidence
+            for event_data, event in zip(events, validated):
+                if (
+                    isinstance(event_data, dict)
+                    and "confidence_score" not in event_data
+                ):
+                    event.confidence_score = 0.8
+            events = validated
+        except ValidationError:
+            # Incomplete dictionaries go through the lenient per-event path
+            events = [
+                _video_event_from_dict(event_data)
+                for event_data in events
+                if isinstance(event_data, dict)
+            ]
+
+    return await create_process_map_from_events_async(
+        events, batch=batch, now_iso=now_iso
+    )
@@ -1,13 +1,39 @@
 #!/usr/bin/env python3
 
-import json
+import heapq
+import itertools
+import operator
 import os
 import argparse
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
 from pathlib import Path
 
-from .models import VideoAnalysisResult, VideoEvent, AudioTranscript
+import ijson
+from pydantic import TypeAdapter, ValidationError
+
+from .models import VideoAnalysisResult, VideoEvent, AudioTranscript, EventType
+
+# Validator for analysis files, built once per process
+_ANALYSIS_ADAPTER = TypeAdapter(VideoAnalysisResult)
+
+# Validators for the streamed arrays, applied to slices of raw items
+_EVENTS_ADAPTER = TypeAdapter(List[VideoEvent])
+_TRANSCRIPTS_ADAPTER = TypeAdapter(List[AudioTranscript])
+
+# Raw items validated per TypeAdapter call when streaming events and transcripts
+_VALIDATE_BATCH = 1000
+
+# Top-level arrays of an analysis file that are streamed item by item
+_STREAMED_KEYS = frozenset({"events", "transcripts"})
+
+# Timeline indicator per event type (see the report legend)
+_EVENT_INDICATORS = {
+    EventType.USER_ACTION: "[A]",
+    EventType.SCREEN_CHANGE: "[S]",
+    EventType.APPLICATION_SWITCH: "[W]",
+}
 
 
 def format_timestamp(timestamp_ms: int) -> str:
@@ -29,180 +55,312 @@ def format_duration(duration_ms: int) -> str:
         return f"{minutes}m {seconds}s"
 
 
-def combine_timeline_events(events: List[VideoEvent], transcripts: List[AudioTranscript]) -> List[Dict[str, Any]]:
-    """Combine events and transcripts into a chronological timeline."""
-    timeline = []
-    
-    # Add events
-    for event in events:
-        timeline.append({
-            "timestamp_ms": event.timestamp_ms,
-            "type": "event",
-            "data": event
-        })
-    
-    # Add transcripts
-    for transcript in transcripts:
-        timeline.append({
-            "timestamp_ms": transcript.timestamp,
-            "type": "transcript",
-            "data": transcript
-        })
-    
-    # Sort by timestamp
-    timeline.sort(key=lambda x: x["timestamp_ms"])
-    return timeline
+def _untimed_last(timestamp: Optional[int]) -> tuple:
+    """Sort key for a timestamp that places items without one last."""
+    return (timestamp is None, timestamp)
+
+
+def _is_sorted(items: List[Any], key: Callable[[Any], Any]) -> bool:
+    """Check whether items are already in ascending order of key."""
+    return all(key(a) <= key(b) for a, b in zip(items, itertools.islice(items, 1, None)))
+
+
+def combine_timeline_events(
+    events: List[VideoEvent], transcripts: List[AudioTranscript]
+) -> List[Tuple[int, str, Any]]:
+    """
+    Combine events and transcripts into a chronological timeline.
+
+    Both inputs normally arrive sorted by timestamp, so they are merged in a
+    single linear pass; unsorted input is sorted first. Untimed items go last.
+
+    Returns:
+        List of (timestamp_ms, "event" | "transcript", item) tuples
+    """
+    def event_key(event: VideoEvent) -> tuple:
+        return _untimed_last(event.timestamp_ms)
+
+    def transcript_key(transcript: AudioTranscript) -> tuple:
+        return _untimed_last(transcript.timestamp)
+
+    if not _is_sorted(events, event_key):
+        events = sorted(events, key=event_key)
+    if not _is_sorted(transcripts, transcript_key):
+        transcripts = sorted(transcripts, key=transcript_key)
+
+    return list(_merge_timeline(events, transcripts))
+
+
+def _merge_timeline(
+    events: Iterable[VideoEvent], transcripts: Iterable[AudioTranscript]
+) -> Iterator[Tuple[int, str, Any]]:
+    """Lazily merge timestamp-sorted events and transcripts into one timeline."""
+    return heapq.merge(
+        ((event.timestamp_ms, "event", event) for event in events),
+        ((transcript.timestamp, "transcript", transcript) for transcript in transcripts),
+        key=lambda entry: _untimed_last(entry[0]),
+    )
 
 
-def export_to_text(analysis_result: VideoAnalysisResult, output_path: str) -> None:
+def export_to_text(
+    analysis_result: VideoAnalysisResult,
+    output_path: str,
+    generated_at: Optional[datetime] = None,
+) -> None:
     """Export VideoAnalysisResult to a human-readable text file."""
-    
-    lines = []
-    
-    # Header
-    lines.append("=" * 80)
-    lines.append("VIDEO PROCESS ANALYSIS REPORT")
-    lines.append("=" * 80)
-    lines.append("")
-    
-    # Basic Information
-    lines.append("BASIC INFORMATION")
-    lines.append("-" * 40)
-    lines.append(f"Session ID: {analysis_result.session_id}")
-    lines.append(f"Processed: {analysis_result.processing_timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"Video Path: {analysis_result.video_metadata.get('path', 'N/A')}")
-    lines.append(f"Duration: {format_duration(analysis_result.process_summary.total_duration_ms)}")
-    lines.append("")
-    
-    # Process Overview
-    lines.append("PROCESS OVERVIEW")
-    lines.append("-" * 40)
-    lines.append(f"Total Events: {analysis_result.process_summary.total_events}")
-    lines.append(f"Transcript Entries: {len(analysis_result.transcripts)}")
-    lines.append(f"Scene Changes: {len(analysis_result.scenes)}")
-    lines.append(f"Complexity Score: {analysis_result.process_summary.complexity_score}/10")
-    lines.append("")
-    
-    # Applications/Tools Used
+    events = analysis_result.events
+
+    _write_report(
+        analysis_result,
+        output_path,
+        timeline=combine_timeline_events(events, analysis_result.transcripts),
+        tools_used={event.tool_name for event in events if event.tool_name},
+        event_counts=Counter(event.event_type for event in events),
+        transcript_count=len(analysis_result.transcripts),
+        generated_at=generated_at or datetime.now(),
+    )
+
+
+def _write_report(
+    analysis_result: VideoAnalysisResult,
+    output_path: str,
+    timeline: Iterable[Tuple[int, str, Any]],
+    tools_used: set,
+    event_counts: Counter,
+    transcript_count: int,
+    generated_at: datetime,
+) -> None:
+    """
+    Write the text report for an analysis result.
+
+    Events and transcripts are read from ``timeline`` and the precomputed
+    aggregates rather than from ``analysis_result``, so they can be streamed.
+    """
+
+    # Stream the report straight to disk instead of building it in memory
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        w = f.write
+
+        # Header
+        w("=" * 80 + "\n")
+        w("VIDEO PROCESS ANALYSIS REPORT\n")
+        w("=" * 80 + "\n")
+        w("\n")
+
+        # Basic Information
+        w("BASIC INFORMATION\n")
+        w("-" * 40 + "\n")
+        w(f"Session ID: {analysis_result.session_id}\n")
+        w(f"Processed: {analysis_result.processing_timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"Video Path: {analysis_result.video_metadata.get('path', 'N/A')}\n")
+        w(f"Duration: {format_duration(analysis_result.process_summary.total_duration_ms)}\n")
+        w("\n")
+
+        # Process Overview
+        w("PROCESS OVERVIEW\n")
+        w("-" * 40 + "\n")
+        w(f"Total Events: {analysis_result.process_summary.total_events}\n")
+        w(f"Transcript Entries: {transcript_count}\n")
+        w(f"Scene Changes: {len(analysis_result.scenes)}\n")
+        w(f"Complexity Score: {analysis_result.process_summary.complexity_score}/10\n")
+        w("\n")
+
+        # Applications/Tools Used
+        if tools_used:
+            w("APPLICATIONS/TOOLS DETECTED\n")
+            w("-" * 40 + "\n")
+            for tool in sorted(tools_used):
+                w(f"• {tool}\n")
+            w("\n")
+
+        # Scene Breakdown
+        if analysis_result.scenes:
+            w("SCENE BREAKDOWN\n")
+            w("-" * 40 + "\n")
+            for i, scene in enumerate(analysis_result.scenes):
+                w(f"Scene {i+1}: {format_timestamp(scene.start_time_ms)} - {format_timestamp(scene.end_time_ms)} "
+                  f"({format_duration(scene.duration_ms)})\n")
+                if scene.change_score:
+                    w(f"  Change Score: {scene.change_score:.2f}\n")
+            w("\n")
+
+        # Combined Timeline (Events + Transcripts)
+        if event_counts or transcript_count:
+            w("CHRONOLOGICAL TIMELINE\n")
+            w("-" * 40 + "\n")
+            w("Legend: [T] = Transcript | [A] = User Action | [S] = Screen Change | [W] = App Switch\n")
+            w("\n")
+
+            for ms, item_type, item in timeline:
+                # Inlined format_timestamp (MM:SS) for the hot loop
+                timestamp_str = (
+                    f"{ms // 60000:02d}:{ms // 1000 % 60:02d}" if ms is not None else "--:--"
+                )
+
+                if item_type == "transcript":
+                    transcript: AudioTranscript = item
+                    # Clean up transcript text and format nicely
+                    text = transcript.text.strip()
+                    if text and text not in ["N/A", ""]:
+                        w(f"[T] {timestamp_str} | {text}\n")
+                        if transcript.confidence and transcript.confidence < 0.8:
+                            w(f"    ^ Low confidence: {transcript.confidence:.2f}\n")
+
+                elif item_type == "event":
+                    event: VideoEvent = item
+                    tool = event.tool
+                    confidence = event.confidence_score
+
+                    # Event type indicator
+                    indicator = _EVENT_INDICATORS.get(event.event_type, "[?]")
+
+                    # Tool context
+                    tool_info = f" ({tool.name})" if tool else ""
+
+                    w(f"{indicator} {timestamp_str}{tool_info} | {event.description}\n")
+
+                    # Additional context
+                    if confidence < 0.8:
+                        w(f"    ^ Low confidence: {confidence:.2f}\n")
+
+            w("\n")
+
+        # Process Summary
+        w("PROCESS WORKFLOW SUMMARY\n")
+        w("-" * 40 + "\n")
+        w(f"{analysis_result.process_summary.workflow_summary}\n")
+        w("\n")
+
+        # Key Insights
+        if analysis_result.process_summary.key_insights:
+            w("KEY INSIGHTS\n")
+            w("-" * 40 + "\n")
+            for insight in analysis_result.process_summary.key_insights:
+                w(f"• {insight}\n")
+            w("\n")
+
+        # Processing Statistics
+        w("PROCESSING STATISTICS\n")
+        w("-" * 40 + "\n")
+        stats = analysis_result.processing_stats
+        if stats:
+            for key, value in stats.items():
+                # Format key nicely
+                formatted_key = key.replace("_", " ").title()
+                w(f"{formatted_key}: {value}\n")
+        w("\n")
+
+        # Event Type Breakdown
+        if event_counts:
+            w("EVENT TYPE BREAKDOWN\n")
+            w("-" * 40 + "\n")
+            for event_type, count in sorted(event_counts.items()):
+                w(f"{event_type.replace('_', ' ').title()}: {count}\n")
+            w("\n")
+
+        # Footer
+        w("=" * 80 + "\n")
+        w(f"Report generated on: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w("=" * 80)
+
+
+def _scan_analysis(
+    json_path: Union[str, os.PathLike]
+) -> Tuple[Dict[str, Any], set, Counter, Dict[str, Tuple[int, bool]]]:
+    """
+    Read an analysis file once, without building its events or transcripts.
+
+    Every top-level field except the streamed arrays is loaded as-is; for the
+    arrays only the aggregates the report header needs are kept.
+
+    Returns:
+        Tuple of (header fields, tool names, event type counts, and
+        {array key: (item count, whether items are in timestamp order)})
+    """
+    builders = {}
+    builder = None
     tools_used = set()
-    for event in analysis_result.events:
-        if event.tool and event.tool.name:
-            tools_used.add(event.tool.name)
-    
-    if tools_used:
-        lines.append("APPLICATIONS/TOOLS DETECTED")
-        lines.append("-" * 40)
-        for tool in sorted(tools_used):
-            lines.append(f"• {tool}")
-        lines.append("")
-    
-    # Scene Breakdown
-    if analysis_result.scenes:
-        lines.append("SCENE BREAKDOWN")
-        lines.append("-" * 40)
-        for i, scene in enumerate(analysis_result.scenes):
-            lines.append(f"Scene {i+1}: {format_timestamp(scene.start_time_ms)} - {format_timestamp(scene.end_time_ms)} "
-                        f"({format_duration(scene.duration_ms)})")
-            if scene.change_score:
-                lines.append(f"  Change Score: {scene.change_score:.2f}")
-        lines.append("")
-    
-    # Combined Timeline (Events + Transcripts)
-    timeline = combine_timeline_events(analysis_result.events, analysis_result.transcripts)
-    
-    if timeline:
-        lines.append("CHRONOLOGICAL TIMELINE")
-        lines.append("-" * 40)
-        lines.append("Legend: [T] = Transcript | [A] = User Action | [S] = Screen Change | [W] = App Switch")
-        lines.append("")
-        
-        for item in timeline:
-            timestamp_str = format_timestamp(item["timestamp_ms"])
-            
-            if item["type"] == "transcript":
-                transcript: AudioTranscript = item["data"]
-                # Clean up transcript text and format nicely
-                text = transcript.text.strip()
-                if text and text not in ["N/A", ""]:
-                    lines.append(f"[T] {timestamp_str} | {text}")
-                    if transcript.confidence and transcript.confidence < 0.8:
-                        lines.append(f"    ^ Low confidence: {transcript.confidence:.2f}")
-            
-            elif item["type"] == "event":
-                event: VideoEvent = item["data"]
-                
-                # Event type indicator
-                if event.event_type == "USER_ACTION":
-                    indicator = "[A]"
-                elif event.event_type == "SCREEN_CHANGE":
-                    indicator = "[S]"
-                elif event.event_type == "APPLICATION_SWITCH":
-                    indicator = "[W]"
-                else:
-                    indicator = "[?]"
-                
-                # Tool context
-                tool_info = ""
-                if event.tool:
-                    tool_info = f" ({event.tool.name})"
-                
-                lines.append(f"{indicator} {timestamp_str}{tool_info} | {event.description}")
-                
-                # Additional context
-                if event.confidence_score < 0.8:
-                    lines.append(f"    ^ Low confidence: {event.confidence_score:.2f}")
-        
-        lines.append("")
-    
-    # Process Summary
-    lines.append("PROCESS WORKFLOW SUMMARY")
-    lines.append("-" * 40)
-    lines.append(analysis_result.process_summary.workflow_summary)
-    lines.append("")
-    
-    # Key Insights
-    if analysis_result.process_summary.key_insights:
-        lines.append("KEY INSIGHTS")
-        lines.append("-" * 40)
-        for insight in analysis_result.process_summary.key_insights:
-            lines.append(f"• {insight}")
-        lines.append("")
-    
-    # Processing Statistics
-    lines.append("PROCESSING STATISTICS")
-    lines.append("-" * 40)
-    stats = analysis_result.processing_stats
-    if stats:
-        for key, value in stats.items():
-            # Format key nicely
-            formatted_key = key.replace("_", " ").title()
-            lines.append(f"{formatted_key}: {value}")
-    lines.append("")
-    
-    # Event Type Breakdown
-    event_counts = {}
-    for event in analysis_result.events:
-        event_type = event.event_type
-        event_counts[event_type] = event_counts.get(event_type, 0) + 1
-    
-    if event_counts:
-        lines.append("EVENT TYPE BREAKDOWN")
-        lines.append("-" * 40)
-        for event_type, count in sorted(event_counts.items()):
-            lines.append(f"{event_type.replace('_', ' ').title()}: {count}")
-        lines.append("")
-    
-    # Footer
-    lines.append("=" * 80)
-    lines.append(f"Report generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("=" * 80)
-    
-    # Write to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    event_counts = Counter()
+    counts = {"events": 0, "transcripts": 0}
+    in_order = {"events": True, "transcripts": True}
+    previous = {"events": None, "transcripts": None}
+    timestamp = event_type = None
+
+    with open(json_path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "":
+                if event == "map_key":
+                    builder = (
+                        None if value in _STREAMED_KEYS
+                        else builders.setdefault(value, ijson.ObjectBuilder())
+                    )
+            elif builder is not None:
+                builder.event(event, value)
+            elif prefix == "events.item.timestamp_ms" or prefix == "transcripts.item.timestamp":
+                timestamp = value
+            elif prefix == "events.item.event_type":
+                event_type = value
+            elif prefix == "events.item.tool.name":
+                if value:
+                    tools_used.add(value)
+            elif prefix == "events.item" or prefix == "transcripts.item":
+                if event == "start_map":
+                    timestamp = event_type = None
+                elif event == "end_map":
+                    key = prefix[:-5]
+                    counts[key] += 1
+                    if key == "events":
+                        event_counts[event_type] += 1
+                    key_timestamp = _untimed_last(timestamp)
+                    if previous[key] is not None and key_timestamp < previous[key]:
+                        in_order[key] = False
+                    previous[key] = key_timestamp
+
+    header = {key: builder.value for key, builder in builders.items()}
+    return header, tools_used, event_counts, {key: (counts[key], in_order[key]) for key in counts}
+
+
+def _iter_items(json_path: Union[str, os.PathLike], key: str) -> Iterator[Dict[str, Any]]:
+    """Yield the raw items of a top-level array one at a time."""
+    with open(json_path, 'rb') as f:
+        yield from ijson.items(f, f"{key}.item", use_float=True)
+
 
+def _validate_items(
+    json_path: Union[str, os.PathLike], key: str, adapter: TypeAdapter
+) -> Iterator[Any]:
+    """Validate a top-level array in slices of _VALIDATE_BATCH raw items."""
+    raw_items = _iter_items(json_path, key)
+    offset = 0
+    while True:
+        batch = list(itertools.islice(raw_items, _VALIDATE_BATCH))
+        if not batch:
+            return
+        try:
+            yield from adapter.validate_python(batch)
+        except ValidationError as e:
+            raise ValueError(f"Invalid JSON structure in {key} (from item {offset}): {e}")
+        offset += len(batch)
 
-def export_analysis_file(json_path: str, output_dir: str = None) -> str:
+
+def _stream_items(
+    json_path: Union[str, os.PathLike],
+    key: str,
+    adapter: TypeAdapter,
+    timestamp_field: str,
+    in_order: bool,
+) -> Iterable[Any]:
+    """Validate a top-level array lazily, loading it only if it must be sorted."""
+    items = _validate_items(json_path, key, adapter)
+    if in_order:
+        return items
+    get = operator.attrgetter(timestamp_field)
+    return sorted(items, key=lambda item: _untimed_last(get(item)))
+
+
+def export_analysis_file(
+    json_path: Union[str, os.PathLike], output_dir: Union[str, os.PathLike] = None
+) -> str:
     """
     Export a JSON analysis file to human-readable text format.
     
@@ -218,13 +376,17 @@ def export_analysis_file(json_path: str, output_dir: str = None) -> str:
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"JSON file not found: {json_path}")
     
-    # Load JSON data
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # One pass for the header fields and event aggregates; events and
+    # transcripts themselves are streamed below
+    header, tools_used, event_counts, array_stats = _scan_analysis(json_path)
+    _, events_in_order = array_stats["events"]
+    transcript_count, transcripts_in_order = array_stats["transcripts"]
     
     # Parse into VideoAnalysisResult
     try:
-        analysis_result = VideoAnalysisResult.model_validate(data)
+        analysis_result = _ANALYSIS_ADAPTER.validate_python(
+            {**header, "events": [], "transcripts": []}
+        )
     except Exception as e:
         raise ValueError(f"Invalid JSON structure: {e}")
     
@@ -234,12 +396,30 @@ def export_analysis_file(json_path: str, output_dir: str = None) -> str:
     
     # Generate output filename
     input_name = Path(json_path).stem
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    generated_at = datetime.now()
+    timestamp = generated_at.strftime('%Y%m%d_%H%M%S')
     output_filename = f"{input_name}_report_{timestamp}.txt"
     output_path = os.path.join(output_dir, output_filename)
     
-    # Export to text
-    export_to_text(analysis_result, output_path)
+    # Export to text, merging events and transcripts as they are read. Items
+    # are validated mid-write, so the report is only moved into place once
+    # it is complete.
+    timeline = _merge_timeline(
+        _stream_items(json_path, "events", _EVENTS_ADAPTER, "timestamp_ms", events_in_order),
+        _stream_items(json_path, "transcripts", _TRANSCRIPTS_ADAPTER, "timestamp", transcripts_in_order),
+    )
+    temp_path = output_path + ".tmp"
+    try:
+        _write_report(
+            analysis_result, temp_path, timeline, tools_used, event_counts, transcript_count, generated_at
+        )
+        os.replace(temp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
     
     return output_path
 
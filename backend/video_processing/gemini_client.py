@@ -1,11 +1,17 @@
+import functools
+import hashlib
+import heapq
 import os
-import json
-import yaml
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 from dotenv import load_dotenv
-import google.generativeai as genai
+import ijson
+import msgspec
+from .response_cache import ResponseCache, video_content_hash
 from .models import (
     VideoEvent,
     EventType,
@@ -17,6 +23,104 @@ from .models import (
 
 load_dotenv()
 
+# Maximum number of Gemini requests in flight at once (per process)
+GEMINI_MAX_CONCURRENCY = 8
+_GEMINI_REQUEST_SLOTS = threading.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+# generate_content and get_file share the SDK's single gRPC channel, which
+# multiplexes concurrent requests over one HTTP/2 connection. Uploads go through
+# the SDK's REST file client instead, whose one keep-alive httplib2 connection
+# is reused across uploads but is not thread-safe, so uploads take turns on it.
+_FILE_UPLOAD_LOCK = threading.Lock()
+
+# Gemini deletes uploaded files after 48 hours; re-upload a little before that
+UPLOAD_TTL_SECONDS = 47 * 60 * 60
+
+# SQLite file caching raw chunk responses by video content, chunk bounds and
+# prompt; set GEMINI_RESPONSE_CACHE to an empty string to disable it
+RESPONSE_CACHE_PATH = os.getenv(
+    "GEMINI_RESPONSE_CACHE", ".gemini-cache/responses.sqlite"
+)
+
+# Process summaries over this many events are built from per-window summaries
+PROCESS_SUMMARY_MAX_EVENTS = 500
+PROCESS_SUMMARY_WINDOW = 200
+
+# Parsed prompt files keyed by (path, mtime), shared by every client in the process
+_PROMPTS_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _genai():
+    """Import the Gemini SDK on first use.
+
+    The SDK takes around half a second to import, which importing this module
+    (and the models it re-exports) should not pay for until a client is used.
+    """
+    import google.generativeai as genai
+
+    return genai
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_loader():
+    """Return yaml and its libyaml-backed loader, imported on first use"""
+    import yaml
+
+    # Prefer the libyaml-backed loader; the pure-Python one is several times slower
+    try:
+        return yaml, yaml.CSafeLoader
+    except AttributeError:
+        print("Warning: libyaml not available, falling back to pure-Python YAML loader")
+        return yaml, yaml.SafeLoader
+
+
+@functools.lru_cache(maxsize=None)
+def configure_gemini(api_key: str) -> None:
+    """Configure the Gemini SDK once per API key.
+
+    Every genai.configure call drops the SDK's cached service clients, so
+    reconfiguring per model would reopen the gRPC channel each time. Calling
+    it once lets all models and requests share the same channel.
+    """
+    _genai().configure(api_key=api_key)
+
+
+def _event_sort_key(event: VideoEvent) -> tuple:
+    """Sort key ordering events by timestamp, with untimed events last"""
+    timestamp = event.timestamp_ms
+    return (timestamp is None, timestamp)
+
+
+def _format_summary_lines(events: List[VideoEvent]) -> List[str]:
+    """Format events as one '[time] tool - type: description' line each"""
+    rows = [
+        (
+            event.timestamp_ms or 0,
+            event.tool_name or "Unknown",
+            event.event_type.value if event.event_type else "Unknown",
+            event.description,
+        )
+        for event in events
+    ]
+    return [
+        f"[{timestamp / 1000:.1f}s] {tool_name} - {event_type}: {description}"
+        for timestamp, tool_name, event_type, description in rows
+    ]
+
+
+def _load_prompts(prompts_file: Union[str, Path]) -> Dict[str, Any]:
+    """Load a prompts YAML file, re-parsing only when it changes on disk"""
+    path = os.path.abspath(prompts_file)
+    key = (path, os.stat(path).st_mtime_ns)
+    prompts = _PROMPTS_CACHE.get(key)
+    if prompts is None:
+        yaml, loader = _yaml_loader()
+        with open(path, "r") as f:
+            prompts = yaml.load(f, Loader=loader)
+        _PROMPTS_CACHE[key] = prompts
+    return prompts
+
 
 # Helper functions to generate Gemini schemas from our domain models
 def generate_video_events_schema():
@@ -97,62 +201,199 @@ def generate_audio_transcripts_schema():
     }
 
 
-def parse_video_events_response(response_data: Dict[str, Any]) -> List[VideoEvent]:
-    """Parse Gemini response into VideoEvent domain models"""
-    events = []
-    for event_data in response_data.get("events", []):
+# Response schemas, built once and shared by every request
+_VIDEO_EVENTS_SCHEMA = generate_video_events_schema()
+_AUDIO_TRANSCRIPTS_SCHEMA = generate_audio_transcripts_schema()
+
+# Generation configs with structured output enforcement, built once
+_VIDEO_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _VIDEO_EVENTS_SCHEMA,
+    "temperature": 0.1,  # Lower temperature for more consistent output
+    "top_p": 0.95,
+    "top_k": 40,
+}
+
+_TRANSCRIPTION_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _AUDIO_TRANSCRIPTS_SCHEMA,
+    "temperature": 0.1,  # Low temperature for accurate transcription
+    "top_p": 0.95,
+    "top_k": 40,
+}
+
+
+# Typed mirrors of the response schemas above, decoded straight from JSON bytes.
+# Structs are slotted, and gc=False skips GC tracking (they never form cycles).
+# Nested object fields default to UNSET so an empty {} can be told apart from
+# one that sets fields; empty objects become None, like any falsy value did
+# when responses were parsed as dicts.
+class _ToolPayload(msgspec.Struct, gc=False):
+    name: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    type: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    url: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    version: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+
+
+class _WorkflowStepPayload(msgspec.Struct, gc=False):
+    step_number: Union[Optional[int], msgspec.UnsetType] = msgspec.UNSET
+    action: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    tool_used: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    data_objects: Union[Optional[List[str]], msgspec.UnsetType] = msgspec.UNSET
+    screenshot_description: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+
+
+class _EventPayload(msgspec.Struct, gc=False):
+    timestamp: Optional[int] = None
+    event_type: Optional[EventType] = None
+    tool: Optional[_ToolPayload] = None
+    description: str = ""
+    workflow_step: Optional[_WorkflowStepPayload] = None
+    confidence: Optional[float] = None
+
+
+class _EventsPayload(msgspec.Struct, gc=False):
+    events: List[_EventPayload] = []
+
+
+class _TranscriptPayload(msgspec.Struct, gc=False):
+    timestamp: Optional[int] = 0
+    speaker: Optional[str] = None
+    text: str = ""
+    confidence: Optional[float] = None
+
+
+class _TranscriptsPayload(msgspec.Struct, gc=False):
+    transcripts: List[_TranscriptPayload] = []
+
+
+# What an empty {} tool or workflow_step object decodes to
+_EMPTY_TOOL_PAYLOAD = _ToolPayload()
+_EMPTY_WORKFLOW_STEP_PAYLOAD = _WorkflowStepPayload()
+
+
+# Compiled once at import and reused for every chunk; these double as the
+# client-side schema check, so no separate JSON Schema pass is needed.
+# Lax decoding matches pydantic's coercion (e.g. 7000.0 -> 7000)
+_EVENTS_DECODER = msgspec.json.Decoder(_EventsPayload, strict=False)
+_TRANSCRIPTS_DECODER = msgspec.json.Decoder(_TranscriptsPayload, strict=False)
+
+
+def parse_video_events_response(
+    response_text: Union[str, bytes], validate_payload: bool = False
+) -> List[VideoEvent]:
+    """
+    Parse Gemini JSON response into VideoEvent domain models
+
+    The msgspec decode already type-checks every field, so models are built
+    with model_construct unless validate_payload is set.
+    """
+    return list(
+        _build_video_events(
+            _EVENTS_DECODER.decode(response_text).events, validate_payload
+        )
+    )
+
+
+def stream_video_events_response(
+    text_chunks: Iterable[str], validate_payload: bool = False
+) -> Iterator[VideoEvent]:
+    """
+    Parse a streamed Gemini JSON response into VideoEvent domain models
+
+    Events are yielded as soon as each one is complete in the stream, so
+    parsing overlaps with the rest of the response arriving.
+    """
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, "events.item", use_float=True)
+
+    def payloads():
+        for text in text_chunks:
+            parser.send(text.encode())
+            for item in items:
+                yield msgspec.convert(item, _EventPayload, strict=False)
+            del items[:]
+        parser.close()
+        for item in items:
+            yield msgspec.convert(item, _EventPayload, strict=False)
+
+    return _build_video_events(payloads(), validate_payload)
+
+
+def _field(value: Any, default: Any = None) -> Any:
+    """Payload field value, or default when the response omitted the field"""
+    return default if value is msgspec.UNSET else value
+
+
+def _build_video_events(
+    payloads: Iterable[_EventPayload], validate_payload: bool
+) -> Iterator[VideoEvent]:
+    """Convert decoded event payloads into VideoEvent domain models"""
+    build_tool = (
+        ToolIdentification if validate_payload else ToolIdentification.model_construct
+    )
+    build_step = WorkflowStep if validate_payload else WorkflowStep.model_construct
+    build_event = VideoEvent if validate_payload else VideoEvent.model_construct
+
+    for event_data in payloads:
         # Create tool if present
         tool = None
-        if event_data.get("tool"):
-            tool = ToolIdentification(
-                name=event_data["tool"].get("name", "Unknown"),
-                type=event_data["tool"].get("type"),
-                url=event_data["tool"].get("url"),
-                version=event_data["tool"].get("version"),
+        tool_data = event_data.tool
+        if tool_data is not None and tool_data != _EMPTY_TOOL_PAYLOAD:
+            tool = build_tool(
+                name=_field(tool_data.name, "Unknown"),
+                type=_field(tool_data.type),
+                url=_field(tool_data.url),
+                version=_field(tool_data.version),
             )
-        
+
         # Create workflow step if present
         workflow_step = None
-        if event_data.get("workflow_step"):
-            ws = event_data["workflow_step"]
-            workflow_step = WorkflowStep(
-                step_number=ws.get("step_number"),
-                action=ws.get("action"),
-                tool_used=ws.get("tool_used"),
-                data_objects=ws.get("data_objects", []),
-                screenshot_description=ws.get("screenshot_description"),
+        ws = event_data.workflow_step
+        if ws is not None and ws != _EMPTY_WORKFLOW_STEP_PAYLOAD:
+            workflow_step = build_step(
+                step_number=_field(ws.step_number),
+                action=_field(ws.action),
+                tool_used=_field(ws.tool_used),
+                data_objects=_field(ws.data_objects, []),
+                screenshot_description=_field(ws.screenshot_description),
             )
-        
+
         # Create VideoEvent
-        event = VideoEvent(
-            timestamp_ms=event_data.get("timestamp"),
-            event_type=EventType(event_data["event_type"]) if event_data.get("event_type") else None,
+        event = build_event(
+            timestamp_ms=event_data.timestamp,
+            event_type=event_data.event_type,
             tool=tool,
-            description=event_data.get("description", ""),
+            description=event_data.description,
             workflow_step=workflow_step,
-            confidence_score=event_data.get("confidence"),
+            confidence_score=event_data.confidence,
         )
-        events.append(event)
-    
-    return events
+        yield event
+
+
+def parse_audio_transcripts_response(
+    response_text: Union[str, bytes], validate_payload: bool = False
+) -> List[AudioTranscript]:
+    """
+    Parse Gemini JSON response into AudioTranscript domain models
 
+    Models are built with model_construct unless validate_payload is set.
+    """
+    build_transcript = (
+        AudioTranscript if validate_payload else AudioTranscript.model_construct
+    )
 
-def parse_audio_transcripts_response(response_data: Dict[str, Any]) -> List[AudioTranscript]:
-    """Parse Gemini response into AudioTranscript domain models"""
     transcripts = []
-    for transcript_data in response_data.get("transcripts", []):
-        # Handle timestamp conversion if needed
-        timestamp = transcript_data.get("timestamp", 0)
-        
+    for transcript_data in _TRANSCRIPTS_DECODER.decode(response_text).transcripts:
         # Create AudioTranscript
-        transcript = AudioTranscript(
-            timestamp=timestamp,
-            speaker=transcript_data.get("speaker"),
-            text=transcript_data.get("text", ""),
-            confidence=transcript_data.get("confidence"),
+        transcript = build_transcript(
+            timestamp=transcript_data.timestamp,
+            speaker=transcript_data.speaker,
+            text=transcript_data.text,
+            confidence=transcript_data.confidence,
         )
         transcripts.append(transcript)
-    
+
     return transcripts
 
 
@@ -162,29 +403,96 @@ class GeminiClient:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
 
-        genai.configure(api_key=self.api_key)
-        self.client = genai.GenerativeModel("gemini-1.5-pro")
+        configure_gemini(self.api_key)
+        self.client = _genai().GenerativeModel("gemini-1.5-pro")
 
         # Load prompts from YAML file - resolve path relative to this module
         if not os.path.isabs(prompts_file):
             module_dir = Path(__file__).parent
             prompts_file = module_dir / prompts_file
-        
-        with open(prompts_file, "r") as f:
-            self.prompts = yaml.safe_load(f)
+
+        self.prompts = _load_prompts(prompts_file)
+
+        # Full prompts built once. Stable instructions come first so
+        # consecutive chunk requests share a prefix; only the segment range
+        # is filled in per chunk.
+        self._video_prompt_template = (
+            self.prompts["video_analysis"].replace("{", "{{").replace("}", "}}")
+            + """
+            
+            Remember: timestamps in milliseconds (7 seconds = 7000ms)
+            
+            For EVERY event:
+            1. Include the tool/application name (Gmail, HubSpot, browser, etc.)
+            2. Describe what's happening clearly
+            
+            Analyze the video segment from {start}s to {end}s.
+            """
+        )
+        self._transcription_prompt = (
+            self.prompts["audio_transcription"]
+            + """
+            
+            CRITICAL: All timestamps MUST be in milliseconds from the start of the video.
+            For example: 1 second = 1000ms, 14 seconds = 14000ms, 1 minute = 60000ms.
+            
+            Provide accurate timestamps IN MILLISECONDS and speaker attribution where identifiable.
+            Include all spoken dialogue, narration, and verbal instructions.
+            Each transcript entry should have its precise timestamp in milliseconds.
+            """
+        )
+
+        # Cached chunk responses are only valid for this exact model, prompt and
+        # schema, so all three go into every cache key
+        self._response_cache = (
+            ResponseCache(RESPONSE_CACHE_PATH) if RESPONSE_CACHE_PATH else None
+        )
+        self._prompt_fingerprint = hashlib.blake2b(
+            repr(
+                (
+                    self.client.model_name,
+                    self._video_prompt_template,
+                    _VIDEO_GENERATION_CONFIG,
+                )
+            ).encode(),
+            digest_size=8,
+        ).hexdigest()
+
+        # Uploaded Gemini files keyed by (path, mtime, size) -> (file, upload time)
+        self._upload_cache: Dict[tuple, tuple] = {}
+        self._upload_lock = threading.Lock()
+
+    def _log_token_usage(self, response, label: str) -> None:
+        """Print prompt/response token counts so video sampling cost can be tuned"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            print(
+                f"{label} token usage: prompt={usage.prompt_token_count}, "
+                f"cached={usage.cached_content_token_count}, "
+                f"response={usage.candidates_token_count}, "
+                f"total={usage.total_token_count}"
+            )
 
     def _upload_file_with_retry(self, file_path: str, max_retries: int = 3):
         """Upload file to Gemini with retry logic for ACTIVE state"""
+        # Larger files take longer to process before they become ACTIVE
+        max_wait_s = 30 + os.path.getsize(file_path) / (1024 * 1024)
+        retry_delay = 2.0
+
         for attempt in range(max_retries):
             try:
-                uploaded_file = genai.upload_file(file_path)
-
-                # Wait for file to become active
-                for _ in range(10):  # Wait up to 10 seconds
-                    if uploaded_file.state.name == "ACTIVE":
-                        return uploaded_file
-                    time.sleep(1)
-                    uploaded_file = genai.get_file(uploaded_file.name)
+                with _FILE_UPLOAD_LOCK:
+                    uploaded_file = _genai().upload_file(file_path)
+
+                # Poll with exponential backoff until active or out of time
+                delay = 0.1
+                deadline = time.monotonic() + max_wait_s
+                while (
+                    uploaded_file.state.name != "ACTIVE" and time.monotonic() < deadline
+                ):
+                    time.sleep(delay + random.random() * delay * 0.25)
+                    delay = min(delay * 2, 2.0)
+                    uploaded_file = _genai().get_file(uploaded_file.name)
 
                 # If still not active, try again
                 if uploaded_file.state.name != "ACTIVE":
@@ -192,7 +500,8 @@ class GeminiClient:
                         f"File {uploaded_file.name} not active, attempt {attempt + 1}"
                     )
                     if attempt < max_retries - 1:
-                        time.sleep(2)
+                        time.sleep(retry_delay + random.random() * retry_delay * 0.25)
+                        retry_delay *= 2
                         continue
                     else:
                         raise Exception(
@@ -204,12 +513,65 @@ class GeminiClient:
             except Exception as e:
                 if attempt < max_retries - 1:
                     print(f"Upload attempt {attempt + 1} failed: {str(e)}, retrying...")
-                    time.sleep(2)
+                    time.sleep(retry_delay + random.random() * retry_delay * 0.25)
+                    retry_delay *= 2
                 else:
                     raise e
 
+    def _get_or_upload(self, file_path: str):
+        """Return an ACTIVE uploaded Gemini file for file_path, uploading only if needed"""
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._upload_lock:
+            cached = self._upload_cache.get(key)
+            if cached is not None:
+                uploaded_file, uploaded_at = cached
+                if time.monotonic() - uploaded_at < UPLOAD_TTL_SECONDS:
+                    try:
+                        if _genai().get_file(uploaded_file.name).state.name == "ACTIVE":
+                            return uploaded_file
+                    except Exception as e:
+                        print(
+                            f"Cached upload {uploaded_file.name} unavailable: {str(e)}"
+                        )
+                del self._upload_cache[key]
+
+            uploaded_file = self._upload_file_with_retry(file_path)
+            self._upload_cache[key] = (uploaded_file, time.monotonic())
+            return uploaded_file
+
+    def _chunk_cache_key(self, video_path: str, chunk: VideoChunk) -> Optional[str]:
+        """Response cache key for a chunk, or None if caching is unavailable"""
+        if self._response_cache is None:
+            return None
+        try:
+            video_hash = video_content_hash(video_path)
+        except OSError as e:
+            print(f"Cannot hash {video_path} for response cache: {str(e)}")
+            return None
+        return (
+            f"{video_hash}/{chunk.chunk_id}/{chunk.start_time}-{chunk.end_time}"
+            f"/{self._prompt_fingerprint}"
+        )
+
+    def _load_cached_chunk(
+        self, cache_key: Optional[str]
+    ) -> Optional[List[VideoEvent]]:
+        """Events parsed from a cached chunk response, or None on a miss"""
+        if cache_key is None:
+            return None
+        response_text = self._response_cache.get(cache_key)
+        if response_text is None:
+            return None
+        try:
+            return parse_video_events_response(response_text)
+        except ValueError as e:
+            print(f"Ignoring unreadable cached response: {str(e)}")
+            return None
+
     def analyze_video_chunk(
-        self, video_path: str, chunk: VideoChunk
+        self, video_path: str, chunk: VideoChunk, uploaded_file=None
     ) -> List[VideoEvent]:
         """
         Analyze a video chunk using Gemini API with structured output enforcement
@@ -217,62 +579,59 @@ class GeminiClient:
         Args:
             video_path: Path to the video file
             chunk: VideoChunk object with timing information
+            uploaded_file: Already uploaded Gemini file for video_path, if any
 
         Returns:
             List of VideoEvent objects
         """
         try:
+            cache_key = self._chunk_cache_key(video_path, chunk)
+            cached_events = self._load_cached_chunk(cache_key)
+            if cached_events is not None:
+                return cached_events
+
             # Upload video file to Gemini with retry logic
-            uploaded_file = self._upload_file_with_retry(video_path)
+            if uploaded_file is None:
+                uploaded_file = self._get_or_upload(video_path)
 
             # Create focused prompt (schema handles structure)
-            analysis_prompt = (
-                self.prompts["video_analysis"]
-                + f"""
-            
-            Analyze the video segment from {chunk.start_time}s to {chunk.end_time}s.
-            
-            Remember: timestamps in milliseconds (7 seconds = 7000ms)
-            
-            For EVERY event:
-            1. Include the tool/application name (Gmail, HubSpot, browser, etc.)
-            2. Describe what's happening clearly
-            """
+            analysis_prompt = self._video_prompt_template.format(
+                start=chunk.start_time, end=chunk.end_time
             )
 
-            # Generate schema for Gemini API
-            response_schema = generate_video_events_schema()
+            # Generate content with schema enforcement, parsing events as the
+            # response streams in rather than after the last byte arrives
+            received = []
 
-            # Generation config with structured output enforcement
-            generation_config = {
-                "response_mime_type": "application/json",
-                "response_schema": response_schema,
-                "temperature": 0.1,  # Lower temperature for more consistent output
-                "top_p": 0.95,
-                "top_k": 40,
-            }
-
-            # Generate content with schema enforcement
-            response = self.client.generate_content(
-                [uploaded_file, analysis_prompt], generation_config=generation_config
-            )
+            def chunk_texts(response):
+                for part in response:
+                    received.append(part.text)
+                    yield part.text
 
-            # Parse JSON response and convert to domain models
             try:
-                result_json = json.loads(response.text)
-                events = parse_video_events_response(result_json)
+                with _GEMINI_REQUEST_SLOTS:
+                    response = self.client.generate_content(
+                        [uploaded_file, analysis_prompt],
+                        generation_config=_VIDEO_GENERATION_CONFIG,
+                        stream=True,
+                    )
+                    events = list(stream_video_events_response(chunk_texts(response)))
+                self._log_token_usage(response, f"Chunk {chunk.chunk_id}")
+                if cache_key is not None:
+                    self._response_cache.set(cache_key, "".join(received))
                 return events
 
-            except (json.JSONDecodeError, ValueError) as e:
+            except (ValueError, ijson.JSONError) as e:
                 print(
                     f"Error parsing/validating response for chunk {chunk.chunk_id}: {str(e)}"
                 )
+                raw_response = "".join(received)
                 # Fallback: create a single event with error info
                 return [
                     VideoEvent(
                         timestamp_ms=int(chunk.start_time * 1000),
                         event_type=EventType.SCREEN_CHANGE,
-                        description=f"Analysis error: {str(e)}. Raw response: {response.text[:500]}",
+                        description=f"Analysis error: {str(e)}. Raw response: {raw_response[:500]}",
                         confidence_score=0.3,
                     )
                 ]
@@ -292,45 +651,21 @@ class GeminiClient:
             List of AudioTranscript objects
         """
         try:
-            uploaded_file = self._upload_file_with_retry(video_path)
-
-            transcription_prompt = (
-                self.prompts["audio_transcription"]
-                + """
-            
-            CRITICAL: All timestamps MUST be in milliseconds from the start of the video.
-            For example: 1 second = 1000ms, 14 seconds = 14000ms, 1 minute = 60000ms.
-            
-            Provide accurate timestamps IN MILLISECONDS and speaker attribution where identifiable.
-            Include all spoken dialogue, narration, and verbal instructions.
-            Each transcript entry should have its precise timestamp in milliseconds.
-            """
-            )
-
-            # Generate schema for Gemini API
-            response_schema = generate_audio_transcripts_schema()
-
-            # Generation config with structured output enforcement
-            generation_config = {
-                "response_mime_type": "application/json",
-                "response_schema": response_schema,
-                "temperature": 0.1,  # Low temperature for accurate transcription
-                "top_p": 0.95,
-                "top_k": 40,
-            }
+            uploaded_file = self._get_or_upload(video_path)
 
             # Generate content with schema enforcement
-            response = self.client.generate_content(
-                [uploaded_file, transcription_prompt],
-                generation_config=generation_config,
-            )
+            with _GEMINI_REQUEST_SLOTS:
+                response = self.client.generate_content(
+                    [uploaded_file, self._transcription_prompt],
+                    generation_config=_TRANSCRIPTION_GENERATION_CONFIG,
+                )
+            self._log_token_usage(response, "Audio transcription")
 
             try:
-                result_json = json.loads(response.text)
-                transcripts = parse_audio_transcripts_response(result_json)
+                transcripts = parse_audio_transcripts_response(response.text)
                 return transcripts
 
-            except (json.JSONDecodeError, ValueError) as e:
+            except ValueError as e:
                 print(f"Error parsing/validating audio transcription: {str(e)}")
                 # Fallback: return error info
                 return [
@@ -346,28 +681,59 @@ class GeminiClient:
             return []
 
     def batch_analyze_chunks(
-        self, video_path: str, chunks: List[VideoChunk]
+        self,
+        video_path: str,
+        chunks: List[VideoChunk],
+        max_workers: Optional[int] = None,
     ) -> List[VideoEvent]:
         """
-        Analyze multiple video chunks in sequence
+        Analyze multiple video chunks concurrently
+
+        The video is uploaded once and the uploaded file is shared by all
+        chunk requests, which run in parallel up to max_workers (at most
+        GEMINI_MAX_CONCURRENCY requests are ever in flight per process).
 
         Args:
             video_path: Path to the video file
             chunks: List of VideoChunk objects
+            max_workers: Number of chunks analyzed in parallel
+                (defaults to GEMINI_MAX_CONCURRENCY)
 
         Returns:
             List of all VideoEvent objects from all chunks
         """
-        all_events = []
+        if not chunks:
+            return []
+
+        # Chunks answered from the response cache need no upload or request
+        cached = [
+            self._load_cached_chunk(self._chunk_cache_key(video_path, chunk))
+            for chunk in chunks
+        ]
+
+        uploaded_file = None
+        if any(events is None for events in cached):
+            try:
+                uploaded_file = self._get_or_upload(video_path)
+            except Exception as e:
+                print(f"Error uploading video for chunk analysis: {str(e)}")
+                return []
 
-        for i, chunk in enumerate(chunks):
+        def analyze(indexed_chunk):
+            i, chunk = indexed_chunk
+            if cached[i] is not None:
+                return cached[i]
             print(f"Analyzing chunk {i+1}/{len(chunks)}: {chunk.chunk_id}")
-            chunk_events = self.analyze_video_chunk(video_path, chunk)
-            all_events.extend(chunk_events)
+            return self.analyze_video_chunk(video_path, chunk, uploaded_file)
 
-        # Sort events by timestamp
-        all_events.sort(key=lambda x: x.timestamp_ms)
-        return all_events
+        workers = max(1, min(max_workers or GEMINI_MAX_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunk_lists = list(executor.map(analyze, enumerate(chunks)))
+
+        # Sort each chunk's events, then k-way merge them by timestamp
+        for chunk_events in chunk_lists:
+            chunk_events.sort(key=_event_sort_key)
+        return list(heapq.merge(*chunk_lists, key=_event_sort_key))
 
     def generate_process_summary(self, events: List[VideoEvent]) -> str:
         """
@@ -380,33 +746,38 @@ class GeminiClient:
             Natural language summary of the business process
         """
         try:
-            # Convert events to a simple format for the prompt
-            events_text = []
-            for event in events:
-                time_sec = event.timestamp_ms / 1000 if event.timestamp_ms else 0
-                tool_name = (
-                    event.tool.name
-                    if event.tool and hasattr(event.tool, "name")
-                    else "Unknown"
-                )
-                event_type = str(event.event_type) if event.event_type else "Unknown"
-
-                events_text.append(
-                    f"[{time_sec:.1f}s] {tool_name} - {event_type}: {event.description}"
-                )
+            event_lines = _format_summary_lines(events)
+
+            # Long recordings are summarized map-reduce style: each window of
+            # events gets a short summary, and the final prompt sees only those
+            if len(event_lines) > PROCESS_SUMMARY_MAX_EVENTS:
+                windows = [
+                    event_lines[i : i + PROCESS_SUMMARY_WINDOW]
+                    for i in range(0, len(event_lines), PROCESS_SUMMARY_WINDOW)
+                ]
+                with ThreadPoolExecutor(
+                    max_workers=min(GEMINI_MAX_CONCURRENCY, len(windows))
+                ) as executor:
+                    partials = list(executor.map(self._summarize_event_window, windows))
+                events_heading = "Summaries of consecutive segments of the video:"
+                event_lines = [
+                    f"Segment {i + 1}:\n{partial}" for i, partial in enumerate(partials)
+                ]
+            else:
+                events_heading = "Events extracted from the video:"
 
             # Create the prompt with all events
             summary_prompt = (
-                self.prompts.get("process_summary", "")
-                + "\n\nEvents extracted from the video:\n\n"
+                self.prompts.get("process_summary", "") + f"\n\n{events_heading}\n\n"
             )
-            summary_prompt += "\n".join(events_text)
+            summary_prompt += "\n".join(event_lines)
             summary_prompt += (
                 "\n\nNow provide a comprehensive analysis of this business process."
             )
 
             # Generate summary using Gemini
-            response = self.client.generate_content(summary_prompt)
+            with _GEMINI_REQUEST_SLOTS:
+                response = self.client.generate_content(summary_prompt)
 
             if response and response.text:
                 return response.text
@@ -416,3 +787,15 @@ class GeminiClient:
         except Exception as e:
             print(f"Error generating process summary: {e}")
             return f"Error generating summary: {str(e)}"
+
+    def _summarize_event_window(self, event_lines: List[str]) -> str:
+        """Condense one window of formatted events into a short summary"""
+        window_prompt = (
+            "Summarize the following events from one segment of a screen recording. "
+            "Keep the order of actions, the tools used and the data being handled, "
+            "and leave out personally identifiable details.\n\n"
+            + "\n".join(event_lines)
+        )
+        with _GEMINI_REQUEST_SLOTS:
+            response = self.client.generate_content(window_prompt)
+        return response.text
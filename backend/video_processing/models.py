@@ -60,6 +60,18 @@ class VideoEvent(BaseModel):
     screenshot_path: Optional[str] = Field(
         None, description="Path to screenshot image for this event (relative to session directory)"
     )
+    screenshot_bytes: Optional[bytes] = Field(
+        None,
+        exclude=True,
+        repr=False,
+        description="In-memory JPEG screenshot, set instead of screenshot_path when extracting to memory",
+    )
+
+    @property
+    def tool_name(self) -> Optional[str]:
+        """Name of the identified tool, or None if no tool was identified."""
+        tool = self.tool
+        return tool.name if tool else None
 
 
 class SceneInfo(BaseModel):
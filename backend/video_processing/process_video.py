@@ -3,11 +3,20 @@
 import os
 import json
 import argparse
+import functools
+import itertools
+import operator
+import subprocess
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from pydantic import TypeAdapter
 
 # from .scene_detector import SceneDetector  # Commented out - bypassing scene detection
-from backend.video_processing.gemini_client import GeminiClient
 from backend.video_processing.models import (
     VideoAnalysisResult,
     VideoEvent,
@@ -15,16 +24,173 @@ from backend.video_processing.models import (
     ProcessSummary,
     SceneInfo,
 )
-from backend.video_processing.export_analysis import export_analysis_file
-from backend.video_processing.screenshot_extractor import ScreenshotExtractor
 import uuid
 
+# Serializers for each analysis result field, built once per process
+_RESULT_FIELD_ADAPTERS = {
+    name: TypeAdapter(field.annotation)
+    for name, field in VideoAnalysisResult.model_fields.items()
+}
+
+# List items serialized together per write when streaming a result
+RESULT_WRITE_BATCH = 256
+
+# Duration used when the video cannot be probed
+DEFAULT_VIDEO_DURATION = 371.0
+
+# Probed (duration_s, fps, nb_frames) keyed by (path, mtime_ns, size), oldest evicted first
+VIDEO_META_CACHE_SIZE = 1000
+_VIDEO_META_CACHE: "OrderedDict[Tuple[str, int, int], Tuple[float, float, int]]" = (
+    OrderedDict()
+)
+# Guards _VIDEO_META_CACHE, which is shared by the worker thread pools
+_VIDEO_META_LOCK = threading.Lock()
+
+
+def _probe(video_path: str) -> Optional[Tuple[float, float, int]]:
+    """
+    Read (duration_s, fps, nb_frames) for a video with a single ffprobe call
+
+    Results are cached per file version, so repeated runs on the same video
+    skip the process spawn. Returns None if the video cannot be probed.
+    """
+    stat = os.stat(video_path)
+    key = (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+    with _VIDEO_META_LOCK:
+        meta = _VIDEO_META_CACHE.get(key)
+        if meta is not None:
+            _VIDEO_META_CACHE.move_to_end(key)
+            return meta
+
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "format=duration:stream=duration,nb_frames,r_frame_rate",
+                "-of",
+                "json",
+                video_path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if result.returncode != 0:
+            print(f"ffprobe failed for {video_path}: {result.stderr.strip()}")
+            return None
+        data = json.loads(result.stdout)
+    except (OSError, subprocess.TimeoutExpired, ValueError) as e:
+        print(f"Could not probe {video_path}: {str(e)}")
+        return None
+
+    stream = (data.get("streams") or [{}])[0]
+    # WebM only reports duration on the container, not the stream
+    duration = stream.get("duration")
+    if duration in (None, "N/A"):
+        duration = data.get("format", {}).get("duration")
+    if duration in (None, "N/A"):
+        return None
+
+    # Frame rate comes as a fraction, e.g. "30/1" or "30000/1001"
+    try:
+        num, _, den = stream.get("r_frame_rate", "0/1").partition("/")
+        fps = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        fps = 0.0
+    nb_frames = stream.get("nb_frames")
+    nb_frames = int(nb_frames) if nb_frames and nb_frames.isdigit() else 0
+
+    meta = (float(duration), fps, nb_frames)
+    with _VIDEO_META_LOCK:
+        _VIDEO_META_CACHE[key] = meta
+        if len(_VIDEO_META_CACHE) > VIDEO_META_CACHE_SIZE:
+            _VIDEO_META_CACHE.popitem(last=False)
+    return meta
+
+
+@functools.lru_cache(maxsize=1)
+def _get_gemini_client():
+    """
+    Gemini client shared by every process_video call in this process
+
+    Imported here so the CLI (e.g. --help) starts without the Gemini SDK.
+    Sharing it also reuses its upload cache across runs. The client is safe
+    to share between threads: its prompts are read-only, the upload cache
+    is guarded by a lock and requests go through the module-level
+    concurrency limits.
+    """
+    from backend.video_processing.gemini_client import GeminiClient
+
+    return GeminiClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_screenshot_extractor():
+    """Screenshot extractor shared by every process_video call in this process"""
+    from backend.video_processing.screenshot_extractor import ScreenshotExtractor
+
+    return ScreenshotExtractor()
+
+
+def _write_result(f, result: VideoAnalysisResult) -> None:
+    """
+    Write a result as indented JSON, one field and one slice of a list at a time
+
+    The output is byte-for-byte what dumping the whole model with indent=2
+    gives, but at most RESULT_WRITE_BATCH events or transcripts are
+    serialized at once.
+    """
+    write = f.write
+    write(b"{")
+    for i, (name, adapter) in enumerate(_RESULT_FIELD_ADAPTERS.items()):
+        value = getattr(result, name)
+        write(
+            b'\n  "%s": ' % name.encode() if i == 0 else b',\n  "%s": ' % name.encode()
+        )
+        if not isinstance(value, list) or not value:
+            write(adapter.dump_json(value, indent=2).replace(b"\n", b"\n  "))
+            continue
+
+        # Each slice dumps as "[\n  item,\n  item\n]"; keep the items and
+        # indent them one level deeper
+        write(b"[")
+        for start in range(0, len(value), RESULT_WRITE_BATCH):
+            if start:
+                write(b",")
+            chunk = adapter.dump_json(
+                value[start : start + RESULT_WRITE_BATCH], indent=2
+            )
+            write(chunk[1:-2].replace(b"\n", b"\n  "))
+        write(b"\n  ]")
+    write(b"\n}")
+
+
+def _sort_by_timestamp(items: list, field: str) -> None:
+    """
+    Sort items in place by a timestamp attribute, untimed items last
+
+    Chunk results and transcripts normally arrive in order already, in which
+    case the single comparison pass below is all that runs.
+    """
+    get = operator.attrgetter(field)
+    timestamps = list(map(get, items))
+    if None in timestamps:
+        items.sort(key=lambda item: (get(item) is None, get(item)))
+    elif any(a > b for a, b in zip(timestamps, itertools.islice(timestamps, 1, None))):
+        items.sort(key=get)
+
 
 def process_video(
-    video_path: str,
-    output_dir: str = "output",
+    video_path: Union[str, os.PathLike],
+    output_dir: Union[str, os.PathLike] = "output",
     scene_threshold: float = 80.0,
     max_chunks: int = None,
+    max_workers: Optional[int] = None,
 ) -> VideoAnalysisResult:
     """
     Main video processing pipeline that implements the multi-stage approach
@@ -34,6 +200,8 @@ def process_video(
         output_dir: Directory to save processing results
         scene_threshold: Sensitivity threshold for scene detection
         max_chunks: Maximum number of chunks to process (for testing/cost control)
+        max_workers: Number of chunks analyzed by Gemini in parallel
+            (defaults to the client's GEMINI_MAX_CONCURRENCY)
 
     Returns:
         AnalysisResult object with all extracted data
@@ -41,7 +209,9 @@ def process_video(
 
     print(f"Starting video processing pipeline for: {video_path}")
 
-    # Validate input
+    # Validate input; the video path stays a str since it is stored in the
+    # chunk and result models and keys the probe and upload caches
+    video_path = os.fspath(video_path)
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
@@ -51,8 +221,8 @@ def process_video(
     session_id = str(uuid.uuid4())[:8]  # Short session ID
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     session_folder = f"session_{timestamp}_{session_id}"
-    session_dir = os.path.join(output_dir, session_folder)
-    Path(session_dir).mkdir(parents=True, exist_ok=True)
+    session_dir = Path(output_dir) / session_folder
+    session_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"Session folder: {session_dir}")
 
@@ -64,11 +234,12 @@ def process_video(
     # chunks = detector.detect_scenes(video_path, output_dir=session_dir)
 
     # Instead, create a single chunk for the entire video
-    # We'll use a default duration of 300 seconds (5 minutes) as a placeholder
-    # In production, you'd want to get the actual video duration
-    # Create single chunk for entire video
-    # Using 300 seconds (5 min) as default, adjust if needed
-    video_duration = 371.0  # Default 5 minutes, adjust based on your videos
+    video_meta = _probe(video_path)
+    if video_meta is not None:
+        video_duration = video_meta[0]
+    else:
+        video_duration = DEFAULT_VIDEO_DURATION
+        print(f"Could not read video duration, assuming {video_duration}s")
 
     chunks = [
         VideoChunk(
@@ -91,31 +262,38 @@ def process_video(
 
     # Stage 2: Gemini API Analysis
     print("Stage 2: AI Analysis with Gemini")
-    client = GeminiClient()
+    client = _get_gemini_client()
 
-    # Analyze video chunks
-    events = client.batch_analyze_chunks(video_path, chunks)
-    print(f"Extracted {len(events)} process events")
-
-    # Transcribe audio
+    # Transcribe audio in the background; it only needs the Gemini API,
+    # so it overlaps with chunk analysis and local screenshot extraction
     print("Transcribing audio...")
-    transcripts = client.transcribe_audio(video_path)
-    print(f"Generated {len(transcripts)} audio transcripts")
-
-    # Keep transcripts separate - don't convert to events
-    # Filter out any TRANSCRIPT type events from video analysis
-    action_events = [e for e in events if e.event_type != "TRANSCRIPT"]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        transcripts_future = executor.submit(client.transcribe_audio, video_path)
+
+        # Analyze video chunks
+        events = client.batch_analyze_chunks(video_path, chunks, max_workers)
+        print(f"Extracted {len(events)} process events")
+
+        # Keep transcripts separate - don't convert to events
+        # Filter out any TRANSCRIPT type events from video analysis
+        action_events = [e for e in events if e.event_type != "TRANSCRIPT"]
+
+        # Stage 2.5: Screenshot Extraction
+        print("Stage 2.5: Extracting Event Screenshots")
+        screenshot_extractor = _get_screenshot_extractor()
+        action_events = screenshot_extractor.extract_event_screenshots(
+            video_path,
+            action_events,
+            session_dir,
+            video_duration_ms=video_meta[0] * 1000 if video_meta else None,
+        )
 
-    # Stage 2.5: Screenshot Extraction
-    print("Stage 2.5: Extracting Event Screenshots")
-    screenshot_extractor = ScreenshotExtractor()
-    action_events = screenshot_extractor.extract_event_screenshots(
-        video_path, action_events, session_dir
-    )
+        transcripts = transcripts_future.result()
+    print(f"Generated {len(transcripts)} audio transcripts")
 
     # Sort events by timestamp
-    action_events.sort(key=lambda x: x.timestamp_ms)
-    transcripts.sort(key=lambda x: x.timestamp)
+    _sort_by_timestamp(action_events, "timestamp_ms")
+    _sort_by_timestamp(transcripts, "timestamp")
 
     # Stage 3: Data Synthesis
     print("Stage 3: Data Synthesis")
@@ -128,7 +306,8 @@ def process_video(
         print("AI process summary generated")
 
     # Calculate total duration from chunks
-    total_duration = max(chunk.end_time for chunk in chunks) if chunks else 0.0
+    # Chunks are in time order, so the last one ends the analyzed span
+    total_duration = chunks[-1].end_time if chunks else 0.0
 
     # Generate summary (using action events only for now)
     summary = generate_summary(action_events, total_duration, ai_process_summary)
@@ -136,16 +315,16 @@ def process_video(
     # Create final result
 
     # Convert chunks to SceneInfo objects
-    scene_infos = []
-    for i, chunk in enumerate(chunks):
-        scene_info = SceneInfo(
+    scene_infos = [
+        SceneInfo(
             scene_id=i,
             start_time_ms=int(chunk.start_time * 1000),
             end_time_ms=int(chunk.end_time * 1000),
             duration_ms=int((chunk.end_time - chunk.start_time) * 1000),
             change_score=chunk.scene_score or 1.0,
         )
-        scene_infos.append(scene_info)
+        for i, chunk in enumerate(chunks)
+    ]
 
     # Create process summary
     process_summary = ProcessSummary(
@@ -175,14 +354,17 @@ def process_video(
     )
 
     # Save results
-    output_file = os.path.join(session_dir, f"analysis_result_{timestamp}.json")
-    with open(output_file, "w") as f:
-        json.dump(result.model_dump(), f, indent=2, default=str)
+    output_file = session_dir / f"analysis_result_{timestamp}.json"
+    # Serialize straight from the models, RESULT_WRITE_BATCH events at a time
+    with open(output_file, "wb") as f:
+        _write_result(f, result)
 
     print(f"Processing complete! Results saved to: {output_file}")
 
     # Generate text report
     try:
+        from backend.video_processing.export_analysis import export_analysis_file
+
         text_report_path = export_analysis_file(output_file)
         print(f"Text report generated: {os.path.basename(text_report_path)}")
     except Exception as e:
@@ -201,40 +383,36 @@ def generate_summary(
     if not events:
         return "No events were detected in the video."
 
-    # Count event types and collect tools
-    event_counts = {}
-    tools_used = set()
-    workflow_steps = []
+    # Count event types, tool interactions and workflow steps in one pass
+    event_counts = Counter()
+    tool_interactions = Counter()
+    workflow_steps = []  # (time_sec, tool_name, description)
 
     for event in events:
-        # Count event types
+        # Count event types by enum member; keyed by value once below
         if event.event_type:
-            event_type = str(event.event_type)
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+            event_counts[event.event_type] += 1
 
-        # Collect tools used
-        if event.tool and hasattr(event.tool, "name"):
-            tools_used.add(event.tool.name)
-        elif event.tool:
-            tools_used.add(str(event.tool))
+        # Count interactions per tool
+        tool_name = event.tool_name
+        if tool_name:
+            tool_interactions[tool_name] += 1
 
-        # Collect workflow steps with tools
-        if event.description:
+        # Collect workflow steps with tools (only the first 20 are shown)
+        if event.description and len(workflow_steps) < 20:
             timestamp_sec = event.timestamp_ms / 1000 if event.timestamp_ms else 0
-            tool_name = (
-                event.tool.name
-                if event.tool and hasattr(event.tool, "name")
-                else "Unknown Tool"
-            )
             workflow_steps.append(
-                {
-                    "time": timestamp_sec,
-                    "tool": tool_name,
-                    "description": event.description,
-                }
+                (timestamp_sec, tool_name or "Unknown Tool", event.description)
             )
 
-    # Build comprehensive summary
+    # Key event type counts by value, e.g. "USER_ACTION"
+    event_counts = Counter(
+        {event_type.value: count for event_type, count in event_counts.items()}
+    )
+    tools_used = tool_interactions.keys()
+
+    # Build comprehensive summary; the summary is at most a few dozen lines,
+    # so a list joined once is cheaper than writing through io.StringIO
     summary_parts = [
         "=" * 60,
         "PROCESS MINING ANALYSIS SUMMARY",
@@ -249,27 +427,14 @@ def generate_summary(
 
     # Tools summary
     if tools_used:
-        summary_parts.extend(
-            [
-                "Tools & Applications Used:",
-            ]
-        )
+        summary_parts.append("Tools & Applications Used:")
         for tool in sorted(tools_used):
-            tool_events = sum(
-                1
-                for e in events
-                if e.tool and hasattr(e.tool, "name") and e.tool.name == tool
-            )
-            summary_parts.append(f"  {tool} ({tool_events} interactions)")
+            summary_parts.append(f"  {tool} ({tool_interactions[tool]} interactions)")
         summary_parts.append("")
 
     # Event type breakdown
     if event_counts:
-        summary_parts.extend(
-            [
-                "Event Type Breakdown:",
-            ]
-        )
+        summary_parts.append("Event Type Breakdown:")
         for event_type, count in sorted(event_counts.items()):
             percentage = (count / len(events)) * 100
             summary_parts.append(f"  {event_type}: {count} ({percentage:.1f}%)")
@@ -281,39 +446,26 @@ def generate_summary(
             ["Process Flow Summary:", "  Key steps detected in the workflow:", ""]
         )
 
-        # Group steps by tool for better readability
-        tool_sequences = []
-        current_tool = None
-        current_sequence = []
-
-        for step in workflow_steps[:20]:  # Show first 20 steps
-            if step["tool"] != current_tool:
-                if current_sequence:
-                    tool_sequences.append(
-                        {"tool": current_tool, "steps": current_sequence}
-                    )
-                current_tool = step["tool"]
-                current_sequence = [step]
-            else:
-                current_sequence.append(step)
-
-        if current_sequence:
-            tool_sequences.append({"tool": current_tool, "steps": current_sequence})
+        # Group consecutive steps by tool for better readability
+        tool_sequences = [
+            {"tool": tool, "steps": list(steps)}
+            for tool, steps in itertools.groupby(
+                workflow_steps[:20], key=operator.itemgetter(1)
+            )
+        ]
 
         # Display tool sequences
         for i, sequence in enumerate(
             tool_sequences[:10], 1
         ):  # Limit to first 10 sequences
-            time_range = f"{sequence['steps'][0]['time']:.0f}s"
+            time_range = f"{sequence['steps'][0][0]:.0f}s"
             if len(sequence["steps"]) > 1:
-                time_range += f"-{sequence['steps'][-1]['time']:.0f}s"
+                time_range += f"-{sequence['steps'][-1][0]:.0f}s"
 
             summary_parts.append(f"  {i}. [{time_range}] {sequence['tool']}:")
-            for step in sequence["steps"][:3]:  # Show max 3 steps per tool
+            for _, _, description in sequence["steps"][:3]:  # Show max 3 steps per tool
                 desc_preview = (
-                    step["description"][:60] + "..."
-                    if len(step["description"]) > 60
-                    else step["description"]
+                    description[:60] + "..." if len(description) > 60 else description
                 )
                 summary_parts.append(f"     -> {desc_preview}")
             if len(sequence["steps"]) > 3:
@@ -329,11 +481,7 @@ def generate_summary(
         summary_parts.append("")
 
     # Process Insights
-    summary_parts.extend(
-        [
-            "Process Insights:",
-        ]
-    )
+    summary_parts.append("Process Insights:")
 
     # Calculate some basic metrics
     if len(tools_used) > 1:
@@ -341,18 +489,16 @@ def generate_summary(
             f"  Multi-tool workflow detected ({len(tools_used)} different applications)"
         )
 
-    if event_counts.get("APPLICATION_SWITCH", 0) > 5:
-        summary_parts.append(
-            f"  High context switching ({event_counts.get('APPLICATION_SWITCH', 0)} app switches)"
-        )
+    app_switches = event_counts["APPLICATION_SWITCH"]
+    if app_switches > 5:
+        summary_parts.append(f"  High context switching ({app_switches} app switches)")
 
-    if event_counts.get("USER_ACTION", 0) > 10:
-        summary_parts.append(
-            f"  Interactive process with {event_counts.get('USER_ACTION', 0)} user actions"
-        )
+    user_actions = event_counts["USER_ACTION"]
+    if user_actions > 10:
+        summary_parts.append(f"  Interactive process with {user_actions} user actions")
 
     # Identify potential automation opportunities
-    if event_counts.get("USER_ACTION", 0) > 20:
+    if user_actions > 20:
         summary_parts.append(
             "  High manual interaction - potential automation opportunity"
         )
@@ -390,6 +536,11 @@ def main():
     parser.add_argument(
         "--max-chunks", type=int, help="Maximum chunks to process (for testing)"
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Number of chunks analyzed by Gemini in parallel",
+    )
     parser.add_argument(
         "--print-summary", action="store_true", help="Print summary to console"
     )
@@ -398,7 +549,11 @@ def main():
 
     try:
         result = process_video(
-            args.video_path, args.output_dir, args.scene_threshold, args.max_chunks
+            args.video_path,
+            args.output_dir,
+            args.scene_threshold,
+            args.max_chunks,
+            args.max_workers,
         )
 
         if args.print_summary:
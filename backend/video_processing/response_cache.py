@@ -0,0 +1,88 @@
+"""
+On-disk cache for raw Gemini chunk analysis responses.
+"""
+
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=64)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    """BLAKE2b digest of a file's contents, memoized per (path, mtime, size)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def video_content_hash(video_path: str) -> str:
+    """Content hash of a video file, computed once until the file changes."""
+    path = os.path.abspath(video_path)
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+class ResponseCache:
+    """
+    Content-addressed store of raw Gemini responses in a SQLite file.
+
+    Keys are built by the caller from the video content hash, the chunk
+    bounds and a fingerprint of the prompt and schema, so re-analyzing the
+    same video with the same prompt skips the API call entirely.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize response cache.
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for key, or None on a miss."""
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute("SELECT value FROM responses WHERE key = ?", (key,))
+                    .fetchone()
+                )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Response cache read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """Store response text under key, replacing any previous value."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                    (key, value),
+                )
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Response cache write failed: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use; callers hold the lock."""
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
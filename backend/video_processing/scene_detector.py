@@ -100,38 +100,34 @@ class SceneDetector:
     def _parse_stats_file(self, stats_file: str, video_path: str) -> List[VideoChunk]:
         """Parse the scenedetect stats CSV file to extract scene timings"""
         chunks = []
+        append = chunks.append
+        to_seconds = _timecode_to_seconds
 
         try:
-            with open(stats_file, "r") as f:
-                # Skip header lines that start with #
-                lines = [
+            with open(stats_file, "r", newline="") as f:
+                # Skip header lines that start with #, streaming rows straight
+                # from the file. Format is typically: Scene Number, Start
+                # Timecode, End Timecode, Length
+                reader = csv.reader(
                     line for line in f if not line.startswith("#") and line.strip()
-                ]
-
-                if not lines:
-                    return chunks
-
-                # Parse CSV data - format is typically: Scene Number, Start Timecode, End Timecode, Length
-                reader = csv.reader(lines)
+                )
                 for i, row in enumerate(reader):
-                    if len(row) >= 3:
-                        try:
-                            # Parse timecodes (format: HH:MM:SS.mmm)
-                            start_time = self._timecode_to_seconds(row[1].strip())
-                            end_time = self._timecode_to_seconds(row[2].strip())
-
-                            chunk = VideoChunk(
-                                chunk_id=f"chunk_{i:04d}",
-                                start_time=start_time,
-                                end_time=end_time,
-                                file_path=video_path,
-                                scene_score=min((end_time - start_time) / 10.0, 1.0),
-                            )
-                            chunks.append(chunk)
-
-                        except (ValueError, IndexError) as e:
-                            print(f"Error parsing CSV row {i}: {str(e)}")
-                            continue
+                    if len(row) < 3:
+                        continue
+                    # Timecodes are HH:MM:SS.mmm; both parse to floats, so the
+                    # chunk needs no further validation. float() ignores the
+                    # padding around fields, so they are not stripped first.
+                    start_time = to_seconds(row[1])
+                    end_time = to_seconds(row[2])
+                    append(
+                        VideoChunk.model_construct(
+                            chunk_id=f"chunk_{i:04d}",
+                            start_time=start_time,
+                            end_time=end_time,
+                            file_path=video_path,
+                            scene_score=min((end_time - start_time) / 10.0, 1.0),
+                        )
+                    )
 
         except Exception as e:
             print(f"Error reading stats file: {str(e)}")
@@ -140,18 +136,18 @@ class SceneDetector:
 
     def _timecode_to_seconds(self, timecode: str) -> float:
         """Convert HH:MM:SS.mmm format to seconds"""
-        try:
-            parts = timecode.split(":")
-            if len(parts) == 3:
-                hours = float(parts[0])
-                minutes = float(parts[1])
-                seconds = float(parts[2])
-                return hours * 3600 + minutes * 60 + seconds
-            elif len(parts) == 2:
-                minutes = float(parts[0])
-                seconds = float(parts[1])
-                return minutes * 60 + seconds
-            else:
-                return float(timecode)
-        except ValueError:
-            return 0.0
+        return _timecode_to_seconds(timecode)
+
+
+def _timecode_to_seconds(timecode: str) -> float:
+    """Convert [[HH:]MM:]SS.mmm format to seconds, or 0.0 if malformed"""
+    parts = timecode.split(":")
+    if len(parts) > 3:
+        return 0.0
+    seconds = 0.0
+    try:
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return 0.0
+    return seconds
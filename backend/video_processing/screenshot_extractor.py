@@ -1,15 +1,103 @@
 #!/usr/bin/env python3
 
+import asyncio
+import functools
 import logging
+import os
+import re
+import shutil
 import subprocess
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+import av
 
 from .models import VideoEvent, EventType
 
+# Ensure even dimensions for the encoder (VP8/WebM compatibility)
+_EVEN_DIMENSIONS_FILTER = "scale=trunc(iw/2)*2:trunc(ih/2)*2"
+
+# Image encoders that take odd frame sizes, so full-size output needs no scaling
+_ANY_SIZE_FORMATS = frozenset({"jpg", "png"})
+
+# Extra video decoded past a batch's last timestamp to find its frame
+_BATCH_TAIL_SECONDS = 1.0
+
+# Number of video durations remembered per extractor
+DURATION_CACHE_SIZE = 256
+
+# Presentation time of each frame reported by the showinfo filter
+_SHOWINFO_PTS_TIME = re.compile(r"Parsed_showinfo.*? pts_time:\s*(\S+)")
+
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_hwaccels() -> Tuple[str, ...]:
+    """Hardware decoding methods this FFmpeg build supports, probed once."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ()
+    if result.returncode != 0:
+        return ()
+    # The first line is the "Hardware acceleration methods:" heading
+    return tuple(line.strip() for line in result.stdout.splitlines()[1:] if line.strip())
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_path(path: str) -> Path:
+    """Resolve an absolute path through its symlinks, memoized."""
+    return Path(path).resolve()
+
+
+def _split_jpeg_stream(data: bytes) -> List[memoryview]:
+    """
+    Split concatenated JPEG images (as written by FFmpeg's image2pipe) apart.
+
+    Header segments are skipped by their length fields; in the entropy-coded
+    data after SOS every 0xFF byte is stuffed or a restart marker, so the
+    next FF D9 is the image's end. A truncated last image is dropped.
+    """
+    view = memoryview(data)
+    frames = []
+    pos = 0
+    while True:
+        start = data.find(b"\xff\xd8", pos)
+        if start == -1:
+            return frames
+        i = start + 2
+        while i + 4 <= len(data) and data[i] == 0xFF:
+            marker = data[i + 1]
+            i += 2 + int.from_bytes(data[i + 2 : i + 4], "big")
+            if marker == 0xDA:  # Start of scan
+                break
+        else:
+            return frames
+        end = data.find(b"\xff\xd9", i)
+        if end == -1:
+            return frames
+        frames.append(view[start : end + 2])
+        pos = end + 2
+
+
+def _partial_path(output_path: Path) -> Path:
+    """Hidden sibling a screenshot is written to before it is moved into place."""
+    return output_path.with_name(f".{output_path.stem}.partial{output_path.suffix}")
+
+
+def _write_complete(output_path: Path, data: bytes) -> None:
+    """Write a screenshot so that output_path only ever holds a whole image."""
+    partial = _partial_path(output_path)
+    partial.write_bytes(data)
+    os.replace(partial, output_path)
+
 
 @dataclass
 class ScreenshotConfig:
@@ -20,7 +108,23 @@ class ScreenshotConfig:
     timeout_seconds: int = 30
     screenshot_subdir: str = "screenshots"
     dedup_threshold_ms: int = 500  # Merge screenshots within 500ms
-    fast_seek: bool = True  # Use fast seek before accurate seek
+    batch_size: int = 50  # Timestamps grabbed per ffmpeg process (1 disables batching)
+    batch_window_ms: int = 5000  # Batch timestamps at most this far apart
+    fast_seek: bool = True  # Seek on the input (keyframe jump) instead of decoding from the start
+    stream_pipe: bool = True  # Read batched JPEGs from FFmpeg's stdout instead of temp files
+    # Optimal Huffman tables make JPEGs ~10% smaller; the extra encoder pass
+    # is lost in decode and process startup time
+    optimize_jpeg_huffman: bool = True
+    # Hardware decoder ("auto", "vaapi", "cuda", "videotoolbox", ...), None for
+    # software; skipped when this FFmpeg build has no such method
+    hwaccel: Optional[str] = "auto"
+    # Keep JPEG screenshots in memory (VideoEvent.screenshot_bytes) instead of
+    # writing files, for callers that serve or embed them directly
+    return_bytes: bool = False
+    # Downscale screenshots to (width, height) thumbnails; -2 for one side
+    # keeps the aspect ratio. JPEG thumbnails use thumbnail_quality.
+    thumbnail_size: Optional[Tuple[int, int]] = None
+    thumbnail_quality: int = 5
 
 
 class ScreenshotExtractor:
@@ -37,23 +141,62 @@ class ScreenshotExtractor:
             config: Configuration object for extraction settings
         """
         self.config = config or ScreenshotConfig()
+        if self.config.return_bytes and self.config.image_format.lower() != "jpg":
+            raise ValueError("return_bytes requires image_format 'jpg'")
         self.logger = logging.getLogger(__name__)
-        self._semaphore = threading.Semaphore(self.config.max_concurrent_extractions)
+        # Video durations keyed by (path, mtime_ns, size), least recent first
+        self._duration_cache: "OrderedDict[Tuple[str, int, int], float]" = OrderedDict()
+        self._duration_lock = threading.Lock()
 
     def extract_event_screenshots(
         self, 
         video_path: str, 
         events: List[VideoEvent], 
-        session_dir: str
+        session_dir: Union[str, os.PathLike],
+        video_duration_ms: Optional[float] = None,
     ) -> List[VideoEvent]:
         """
         Extract screenshots for all non-transcript events and update event objects
         with screenshot paths.
 
+        Runs extract_event_screenshots_async in a new event loop, so it must
+        not be called from a running loop; await the coroutine there instead.
+
         Args:
             video_path: Path to the source video file
             events: List of VideoEvent objects to extract screenshots for
             session_dir: Session directory to save screenshots
+            video_duration_ms: Video duration if already known, to skip probing
+
+        Returns:
+            Updated list of VideoEvent objects with screenshot_path populated
+        """
+        return asyncio.run(
+            self.extract_event_screenshots_async(
+                video_path, events, session_dir, video_duration_ms
+            )
+        )
+
+    async def extract_event_screenshots_async(
+        self, 
+        video_path: str, 
+        events: List[VideoEvent], 
+        session_dir: Union[str, os.PathLike],
+        video_duration_ms: Optional[float] = None,
+    ) -> List[VideoEvent]:
+        """
+        Extract screenshots for all non-transcript events and update event objects
+        with screenshot paths.
+
+        FFmpeg processes are awaited on the event loop, at most
+        max_concurrent_extractions at a time, instead of each blocking a
+        worker thread.
+
+        Args:
+            video_path: Path to the source video file
+            events: List of VideoEvent objects to extract screenshots for
+            session_dir: Session directory to save screenshots
+            video_duration_ms: Video duration if already known, to skip probing
 
         Returns:
             Updated list of VideoEvent objects with screenshot_path populated
@@ -72,20 +215,25 @@ class ScreenshotExtractor:
         # Validate video path
         video_path_obj = self._sanitize_path(video_path)
         if not video_path_obj.exists():
-            self.logger.error(f"Video file not found: {video_path}")
+            self.logger.error("Video file not found: %s", video_path)
             return events
 
         # Get video duration for clamping
-        video_duration_ms = self._get_video_duration_ms(str(video_path_obj))
+        if video_duration_ms is None:
+            # May fall back to ffprobe processes, so keep it off the loop
+            video_duration_ms = await asyncio.to_thread(
+                self._get_video_duration_ms, str(video_path_obj)
+            )
         if video_duration_ms is None:
             self.logger.warning("Could not determine video duration, proceeding without clamping")
             video_duration_ms = float('inf')
 
         # Create screenshots directory
         screenshots_dir = Path(session_dir) / self.config.screenshot_subdir
-        screenshots_dir.mkdir(exist_ok=True)
+        if not self.config.return_bytes:
+            screenshots_dir.mkdir(exist_ok=True)
 
-        self.logger.info(f"📸 Extracting screenshots for {len(action_events)} events...")
+        self.logger.info("📸 Extracting screenshots for %d events...", len(action_events))
 
         # Extract unique, clamped timestamps
         extraction_tasks = self._prepare_extraction_tasks(
@@ -97,22 +245,35 @@ class ScreenshotExtractor:
             return events
 
         # Perform batch extraction with concurrency
-        screenshot_results = self._batch_extract_screenshots(
+        screenshot_results = await self._batch_extract_screenshots(
             str(video_path_obj), extraction_tasks
         )
 
         # Update events with screenshot paths
-        self._update_events_with_screenshots(action_events, screenshot_results)
+        self._update_events_with_screenshots(
+            action_events, extraction_tasks, screenshot_results
+        )
 
         success_count = sum(1 for result in screenshot_results.values() if result)
-        self.logger.info(f"📸 Screenshot extraction complete: {success_count}/{len(extraction_tasks)} successful")
+        self.logger.info(
+            "📸 Screenshot extraction complete: %d/%d successful",
+            success_count, len(extraction_tasks)
+        )
         
         return events
 
     def _sanitize_path(self, path: str) -> Path:
-        """Sanitize and validate file path."""
+        """
+        Sanitize and validate file path.
+
+        Absolute, normalized paths that are not symlinks are used as given;
+        only symlinks pay for a (memoized) full resolve().
+        """
         try:
-            return Path(path).resolve()
+            path = os.path.abspath(path)
+            if not os.path.islink(path):
+                return Path(path)
+            return _resolve_path(path)
         except Exception as e:
             raise ValueError(f"Invalid path: {path}") from e
 
@@ -131,16 +292,64 @@ class ScreenshotExtractor:
         if not timestamps_ms:
             return []
         
-        sorted_timestamps = sorted(set(timestamps_ms))
-        deduplicated = [sorted_timestamps[0]]
-        
-        for ts in sorted_timestamps[1:]:
-            if ts - deduplicated[-1] >= self.config.dedup_threshold_ms:
+        # Greedy scan: keep a timestamp once it is a full threshold past the
+        # last kept one
+        threshold_ms = self.config.dedup_threshold_ms
+        deduplicated = []
+        next_allowed = None
+        for ts in sorted(set(timestamps_ms)):
+            if next_allowed is None or ts >= next_allowed:
                 deduplicated.append(ts)
+                next_allowed = ts + threshold_ms
         
         return deduplicated
 
     def _get_video_duration_ms(self, video_path: str) -> Optional[float]:
+        """
+        Get video duration in milliseconds, memoized per file version.
+
+        The container header is read in-process with PyAV; FFprobe is only
+        used when PyAV cannot read the file or report its duration.
+        """
+        try:
+            stat = os.stat(video_path)
+        except OSError as e:
+            self.logger.error("Cannot stat video for duration detection: %s", e)
+            return None
+        key = (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._duration_lock:
+            duration_ms = self._duration_cache.get(key)
+            if duration_ms is not None:
+                self._duration_cache.move_to_end(key)
+                return duration_ms
+
+        duration_ms = self._av_duration_ms(video_path)
+        if duration_ms is None:
+            duration_ms = self._ffprobe_duration_ms(video_path)
+        if duration_ms is not None:
+            with self._duration_lock:
+                self._duration_cache[key] = duration_ms
+                if len(self._duration_cache) > DURATION_CACHE_SIZE:
+                    self._duration_cache.popitem(last=False)
+        return duration_ms
+
+    def _av_duration_ms(self, video_path: str) -> Optional[float]:
+        """Read the video duration from the container header with PyAV."""
+        try:
+            with av.open(str(video_path), metadata_errors="ignore") as container:
+                # Container duration is in AV_TIME_BASE units (microseconds)
+                if container.duration:
+                    return container.duration / 1000.0
+                if container.streams.video:
+                    stream = container.streams.video[0]
+                    if stream.duration and stream.time_base:
+                        return float(stream.duration * stream.time_base) * 1000
+        except (av.FFmpegError, OSError) as e:
+            self.logger.warning("PyAV could not read video duration: %s", e)
+        return None
+
+    def _ffprobe_duration_ms(self, video_path: str) -> Optional[float]:
         """Get video duration in milliseconds using FFprobe with fallback methods."""
         try:
             # Try multiple methods for duration detection
@@ -218,17 +427,17 @@ class ScreenshotExtractor:
                                     return duration_sec * 1000
                     
                 except subprocess.TimeoutExpired:
-                    self.logger.warning(f"Timeout on duration method {i+1}")
+                    self.logger.warning("Timeout on duration method %d", i + 1)
                     continue
                 except Exception as e:
-                    self.logger.warning(f"Duration method {i+1} failed: {e}")
+                    self.logger.warning("Duration method %d failed: %s", i + 1, e)
                     continue
             
             self.logger.warning("All duration detection methods failed")
             return None
             
         except Exception as e:
-            self.logger.error(f"Critical error in duration detection: {e}")
+            self.logger.error("Critical error in duration detection: %s", e)
             return None
 
     def _prepare_extraction_tasks(
@@ -236,12 +445,14 @@ class ScreenshotExtractor:
         events: List[VideoEvent], 
         video_duration_ms: float, 
         screenshots_dir: Path
-    ) -> Dict[int, Tuple[float, Path, int]]:
+    ) -> Dict[int, Tuple[float, Path, List[int]]]:
         """
         Prepare extraction tasks with deduplicated and clamped timestamps.
         
         Returns:
-            Dict mapping original timestamp_ms to (timestamp_sec, output_path, event_index)
+            Dict mapping original timestamp_ms to (timestamp_sec, output_path,
+            event_indices), where event_indices lists every event whose
+            timestamp was merged into this one
         """
         # Collect valid timestamps with their event indices
         timestamp_to_events = {}
@@ -251,6 +462,17 @@ class ScreenshotExtractor:
         
         # Deduplicate timestamps
         unique_timestamps = self._deduplicate_timestamps(list(timestamp_to_events.keys()))
+
+        # Group events by the kept timestamp their cluster was merged into,
+        # i.e. the latest kept timestamp at or before their own
+        cluster_events = {}
+        kept = -1
+        for timestamp_ms in sorted(timestamp_to_events):
+            while kept + 1 < len(unique_timestamps) and unique_timestamps[kept + 1] <= timestamp_ms:
+                kept += 1
+            cluster_events.setdefault(unique_timestamps[kept], []).extend(
+                timestamp_to_events[timestamp_ms]
+            )
         
         extraction_tasks = {}
         for timestamp_ms in unique_timestamps:
@@ -258,138 +480,434 @@ class ScreenshotExtractor:
             if timestamp_sec is not None:
                 # Use first event index for filename
                 first_event_idx = timestamp_to_events[timestamp_ms][0]
-                filename = f"event_{first_event_idx+1:03d}_{timestamp_ms}ms.{self.config.image_format}"
+                filename = (
+                    f"event_{first_event_idx+1:03d}_{timestamp_ms}ms"
+                    f"{self._settings_suffix()}.{self.config.image_format}"
+                )
                 output_path = screenshots_dir / filename
                 
-                extraction_tasks[timestamp_ms] = (timestamp_sec, output_path, first_event_idx)
+                extraction_tasks[timestamp_ms] = (
+                    timestamp_sec, output_path, cluster_events[timestamp_ms]
+                )
         
         return extraction_tasks
 
+    def _settings_suffix(self) -> str:
+        """
+        File name tag for non-default image settings, so reused screenshots
+        always match the size and quality they would be extracted with now.
+        """
+        if self.config.thumbnail_size:
+            width, height = self.config.thumbnail_size
+            return f"_{width}x{height}q{self.config.thumbnail_quality}"
+        if self.config.image_quality != ScreenshotConfig.image_quality:
+            return f"_q{self.config.image_quality}"
+        return ""
+
+    def _hwaccel_args(self) -> List[str]:
+        """FFmpeg input options for hardware decoding, if available."""
+        hwaccel = self.config.hwaccel
+        if not hwaccel:
+            return []
+        available = _ffmpeg_hwaccels()
+        if hwaccel == "auto" and available or hwaccel in available:
+            # Decoded frames are copied back to system memory, so the
+            # software filters and encoder work unchanged
+            return ["-hwaccel", hwaccel]
+        return []
+
     def _build_ffmpeg_command(self, video_path: str, timestamp_sec: float, output_path: Path) -> List[str]:
         """Build FFmpeg command with VP8/WebM compatibility fixes."""
-        cmd = ["ffmpeg"]
+        # Only errors are logged; stderr is read just to report failures
+        cmd = ["ffmpeg", "-hide_banner", "-v", "error"]
+        cmd.extend(self._hwaccel_args())
         
-        # Fast seek for performance (optional)
-        if self.config.fast_seek and timestamp_sec > 10:  # Only for seeks > 10s
-            cmd.extend(["-ss", str(max(0, timestamp_sec - 5))])  # Fast seek to ~5s before
+        # Input seeking jumps to the keyframe before the timestamp and decodes
+        # only from there; ffmpeg's accurate_seek (on by default when
+        # transcoding) still lands on the exact frame. Output seeking after
+        # -i decodes and discards everything before the timestamp.
+        if self.config.fast_seek:
+            cmd.extend(["-ss", str(timestamp_sec), "-i", str(video_path)])
+        else:
+            cmd.extend(["-i", str(video_path), "-ss", str(timestamp_sec)])
         
-        cmd.extend([
-            "-i", str(video_path),  # Input
-            "-ss", str(timestamp_sec),  # Accurate seek
-            "-frames:v", "1",  # One frame
-        ])
+        cmd.extend(["-frames:v", "1"])  # One frame
+        scale = self._scale_filter()
+        if scale:
+            cmd.extend(["-vf", scale])
+        cmd.extend(self._encoder_args())
+        if self.config.return_bytes:
+            cmd.extend(["-f", "image2pipe", "-c:v", "mjpeg", "-"])
+        else:
+            cmd.extend([
+                "-y",  # Overwrite
+                str(output_path)
+            ])
         
+        return cmd
+
+    def _scale_filter(self) -> Optional[str]:
+        """
+        Final scale filter: thumbnail size, full size with even dimensions,
+        or None when the encoder takes the native size and no pass is needed.
+        """
+        if self.config.thumbnail_size:
+            width, height = self.config.thumbnail_size
+            return f"scale={width}:{height}:flags=fast_bilinear"
+        if self.config.image_format.lower() in _ANY_SIZE_FORMATS:
+            return None
+        return _EVEN_DIMENSIONS_FILTER
+
+    def _encoder_args(self) -> List[str]:
+        """FFmpeg output options shared by single and batched extraction."""
         # VP8/WebM compatibility fixes
-        cmd.extend([
-            "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",  # Ensure even dimensions for encoder
+        args = [
             "-pix_fmt", "yuv420p",  # Force compatible pixel format
-            "-strict", "unofficial",  # Allow non-standard YUV range
-        ])
+            # The MJPEG encoder rejects limited-range yuv420p without this
+            "-strict", "unofficial",
+        ]
         
         # Format-aware quality settings  
         if self.config.image_format.lower() == "jpg":
-            cmd.extend([
-                "-q:v", str(self.config.image_quality),
-                "-huffman", "optimal"  # Better JPEG compression
-            ])
+            quality = (
+                self.config.thumbnail_quality
+                if self.config.thumbnail_size
+                else self.config.image_quality
+            )
+            args.extend(["-q:v", str(quality)])
+            if self.config.optimize_jpeg_huffman:
+                args.extend(["-huffman", "optimal"])  # Better JPEG compression
         elif self.config.image_format.lower() == "png":
-            cmd.extend([
+            args.extend([
                 "-compression_level", str(min(9, self.config.image_quality)),
                 "-pix_fmt", "rgba"  # PNG with alpha support
             ])
         
-        cmd.extend([
-            "-y",  # Overwrite
-            str(output_path)
-        ])
-        
-        return cmd
+        return args
 
-    def _extract_single_screenshot(self, video_path: str, timestamp_sec: float, output_path: Path) -> bool:
+    async def _run_ffmpeg(
+        self, cmd: List[str], timeout: float, capture_stdout: bool = False
+    ) -> Tuple[int, bytes, str]:
+        """
+        Run an FFmpeg command on the event loop.
+
+        Returns:
+            (returncode, stdout bytes (empty unless captured), stderr bytes)
+
+        Raises:
+            asyncio.TimeoutError: If FFmpeg did not finish in time (it is killed)
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stdout or b"", stderr
+
+    async def _extract_single_screenshot(
+        self, video_path: str, timestamp_sec: float, output_path: Path
+    ) -> Union[bool, bytes]:
         """
         Extract a single screenshot using FFmpeg.
         
         Returns:
-            True if successful, False otherwise
+            True if successful (the JPEG bytes when return_bytes is set),
+            False otherwise
         """
-        with self._semaphore:  # Rate limiting
-            try:
-                cmd = self._build_ffmpeg_command(video_path, timestamp_sec, output_path)
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.config.timeout_seconds
-                )
-
-                if result.returncode == 0 and output_path.exists():
-                    return True
-                else:
+        # FFmpeg writes beside the final path; only a finished image is moved
+        # into place, so an interrupted run never leaves one to be reused
+        partial = _partial_path(output_path)
+        try:
+            cmd = self._build_ffmpeg_command(video_path, timestamp_sec, partial)
+            
+            returncode, stdout, stderr = await self._run_ffmpeg(
+                cmd, self.config.timeout_seconds, capture_stdout=self.config.return_bytes
+            )
+
+            if returncode == 0 and self.config.return_bytes and stdout:
+                return stdout
+            if returncode == 0 and not self.config.return_bytes and partial.exists():
+                os.replace(partial, output_path)
+                return True
+            else:
+                if self.logger.isEnabledFor(logging.WARNING):
                     self.logger.warning(
-                        f"FFmpeg failed for {output_path.name}: {result.stderr.strip()}"
+                        "FFmpeg failed for %s: %s",
+                        output_path.name,
+                        stderr[-512:].decode(errors="replace").strip(),
                     )
-                    return False
-
-            except subprocess.TimeoutExpired:
-                self.logger.warning(f"Timeout extracting {output_path.name}")
-                return False
-            except Exception as e:
-                self.logger.error(f"Error extracting {output_path.name}: {e}")
                 return False
 
-    def _batch_extract_screenshots(
+        except asyncio.TimeoutError:
+            self.logger.warning("Timeout extracting %s", output_path.name)
+            return False
+        except Exception as e:
+            self.logger.error("Error extracting %s: %s", output_path.name, e)
+            return False
+        finally:
+            partial.unlink(missing_ok=True)
+
+    async def _batch_extract_screenshots(
         self, 
         video_path: str, 
-        extraction_tasks: Dict[int, Tuple[float, Path, int]]
-    ) -> Dict[int, Optional[str]]:
+        extraction_tasks: Dict[int, Tuple[float, Path, List[int]]]
+    ) -> Dict[int, Union[str, bytes, None]]:
         """
         Extract screenshots concurrently.
+
+        Timestamps close enough together to decode through are grouped into
+        batches, one FFmpeg process per batch; isolated timestamps are still
+        seeked to individually. Screenshots already on disk, e.g. when a
+        session is re-run, are reused without running FFmpeg.
         
         Returns:
-            Dict mapping timestamp_ms to screenshot path (or None if failed)
+            Dict mapping timestamp_ms to screenshot path, or JPEG bytes when
+            return_bytes is set (None if failed)
         """
         results = {}
+
+        # Tasks are keyed by sorted timestamps, so each batch is a contiguous
+        # stretch of the video
+        batches = []
+        for timestamp_ms, task in extraction_tasks.items():
+            output_path = task[1]
+            try:
+                if not self.config.return_bytes and output_path.stat().st_size > 0:
+                    results[timestamp_ms] = output_path.name
+                    continue
+            except OSError:
+                pass
+
+            if (
+                batches
+                and len(batches[-1]) < self.config.batch_size
+                and timestamp_ms - batches[-1][-1][0] <= self.config.batch_window_ms
+            ):
+                batches[-1].append((timestamp_ms, task))
+            else:
+                batches.append([(timestamp_ms, task)])
         
-        with ThreadPoolExecutor(max_workers=self.config.max_concurrent_extractions) as executor:
-            # Submit all tasks
-            future_to_timestamp = {}
-            for timestamp_ms, (timestamp_sec, output_path, _) in extraction_tasks.items():
-                future = executor.submit(
-                    self._extract_single_screenshot, 
-                    video_path, 
-                    timestamp_sec, 
-                    output_path
+        # Run all batches, at most max_concurrent_extractions at a time
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_extractions)
+
+        async def extract(batch):
+            async with semaphore:
+                return await self._extract_screenshot_batch(video_path, batch)
+
+        outcomes = await asyncio.gather(
+            *(extract(batch) for batch in batches), return_exceptions=True
+        )
+
+        # Collect results
+        for batch, extracted in zip(batches, outcomes):
+            if isinstance(extracted, Exception):
+                self.logger.error(
+                    "Task failed for timestamps %s-%s: %s",
+                    batch[0][0], batch[-1][0], extracted
                 )
-                future_to_timestamp[future] = timestamp_ms
-            
-            # Collect results
-            for future in as_completed(future_to_timestamp):
-                timestamp_ms = future_to_timestamp[future]
-                try:
-                    success = future.result()
-                    if success:
-                        _, output_path, _ = extraction_tasks[timestamp_ms]
-                        # Store relative path
-                        results[timestamp_ms] = output_path.name
-                    else:
-                        results[timestamp_ms] = None
-                except Exception as e:
-                    self.logger.error(f"Task failed for timestamp {timestamp_ms}: {e}")
+                extracted = {}
+            for timestamp_ms, (_, output_path, _) in batch:
+                if timestamp_ms not in extracted:
                     results[timestamp_ms] = None
+                elif self.config.return_bytes:
+                    results[timestamp_ms] = extracted[timestamp_ms]
+                else:
+                    # Store relative path
+                    results[timestamp_ms] = output_path.name
         
         return results
 
+    async def _extract_screenshot_batch(
+        self,
+        video_path: str,
+        batch: List[Tuple[int, Tuple[float, Path, List[int]]]]
+    ) -> Dict[int, Optional[bytes]]:
+        """
+        Extract a sorted batch of screenshots with a single FFmpeg process,
+        falling back to one process per screenshot for any it missed.
+
+        Returns:
+            Dict whose keys are the timestamp_ms values whose screenshot was
+            extracted; values are the JPEG bytes when return_bytes is set
+        """
+        extracted = {}
+        if len(batch) > 1:
+            extracted = await self._run_batch_ffmpeg(video_path, batch)
+
+        for timestamp_ms, (timestamp_sec, output_path, _) in batch:
+            if timestamp_ms in extracted:
+                continue
+            screenshot = await self._extract_single_screenshot(
+                video_path, timestamp_sec, output_path
+            )
+            if screenshot:
+                extracted[timestamp_ms] = screenshot if self.config.return_bytes else None
+        return extracted
+
+    async def _run_batch_ffmpeg(
+        self,
+        video_path: str,
+        batch: List[Tuple[int, Tuple[float, Path, List[int]]]]
+    ) -> Dict[int, Optional[bytes]]:
+        """
+        Decode once across the batch's stretch of video and keep only the
+        frames at the requested timestamps.
+
+        Returns:
+            Same as _extract_screenshot_batch
+        """
+        start_sec = batch[0][1][0]
+        offsets = [timestamp_sec - start_sec for _, (timestamp_sec, _, _) in batch]
+
+        # Select the first frame at or after each offset (times restart at 0
+        # after the input seek); showinfo logs the time of every kept frame
+        select = "+".join(
+            f"gte(t,{offset:.3f})*(isnan(prev_selected_t)+lt(prev_selected_t,{offset:.3f}))"
+            for offset in offsets
+        )
+        first_output = batch[0][1][1]
+        pattern = first_output.with_name(f".batch_{first_output.stem}_%04d{first_output.suffix}")
+
+        filters = [f"select='{select}'", "showinfo"]
+        scale = self._scale_filter()
+        if scale:
+            filters.append(scale)
+
+        cmd = ["ffmpeg"]
+        cmd.extend(self._hwaccel_args())
+        cmd.extend([
+            "-ss", str(start_sec),
+            "-t", str(offsets[-1] + _BATCH_TAIL_SECONDS),  # Stop decoding after the batch
+            "-i", str(video_path),
+            "-vf", ",".join(filters),
+            "-fps_mode", "passthrough",  # One image per selected frame
+        ])
+        cmd.extend(self._encoder_args())
+
+        # JPEGs can come back concatenated on stdout, skipping the temp files
+        pipe = self.config.return_bytes or (
+            self.config.stream_pipe and self.config.image_format.lower() == "jpg"
+        )
+        if pipe:
+            cmd.extend(["-f", "image2pipe", "-c:v", "mjpeg", "-"])
+        else:
+            cmd.extend(["-y", str(pattern)])
+
+        try:
+            returncode, stdout, stderr = await self._run_ffmpeg(
+                cmd, self.config.timeout_seconds * len(batch), capture_stdout=pipe
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("Timeout extracting batch starting at %s", first_output.name)
+            return {}
+        except Exception as e:
+            self.logger.error("Error extracting batch starting at %s: %s", first_output.name, e)
+            return {}
+
+        stderr = stderr.decode(errors="replace")
+        frame_times = [float(t) for t in _SHOWINFO_PTS_TIME.findall(stderr)]
+        if pipe:
+            frames = _split_jpeg_stream(stdout)
+            complete = len(frames) == len(frame_times)
+        else:
+            frames = [Path(str(pattern) % (i + 1)) for i in range(len(frame_times))]
+            complete = all(p.exists() for p in frames)
+        if returncode != 0 or not frames or not complete:
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning(
+                    "Batch FFmpeg failed for %s: %s",
+                    first_output.name, stderr.strip()[-512:]
+                )
+            if not pipe:
+                for frame_path in frames:
+                    frame_path.unlink(missing_ok=True)
+            return {}
+
+        # The file writes run off the event loop so other FFmpeg processes'
+        # output keeps being read meanwhile
+        return await asyncio.to_thread(
+            self._save_batch_frames, batch, offsets, frame_times, frames, pipe
+        )
+
+    def _save_batch_frames(
+        self,
+        batch: List[Tuple[int, Tuple[float, Path, List[int]]]],
+        offsets: List[float],
+        frame_times: List[float],
+        frames: list,
+        pipe: bool
+    ) -> Dict[int, Optional[bytes]]:
+        """
+        Write each batch timestamp's frame to its screenshot path.
+
+        Frames are JPEG bytes when piped (kept in memory instead when
+        return_bytes is set), otherwise numbered temp files that are renamed
+        into place (and removed if unused).
+
+        Returns:
+            Same as _extract_screenshot_batch
+        """
+        # Each screenshot is the first kept frame at or after its offset;
+        # several nearby timestamps can share one frame of a sparse video
+        extracted = {}
+        claimed = {}
+        frame = 0
+        for (timestamp_ms, (_, output_path, _)), offset in zip(batch, offsets):
+            while frame < len(frame_times) and frame_times[frame] < offset - 0.001:
+                frame += 1
+            if frame == len(frame_times):
+                break
+            extracted[timestamp_ms] = None
+            if self.config.return_bytes:
+                extracted[timestamp_ms] = bytes(frames[frame])
+            elif pipe:
+                _write_complete(output_path, frames[frame])
+            elif frame in claimed:
+                partial = _partial_path(output_path)
+                shutil.copyfile(claimed[frame], partial)
+                os.replace(partial, output_path)
+            else:
+                # FFmpeg has exited, so its numbered output is complete
+                os.replace(frames[frame], output_path)
+            claimed.setdefault(frame, output_path)
+
+        if not pipe:
+            for i, frame_path in enumerate(frames):
+                if i not in claimed:
+                    frame_path.unlink(missing_ok=True)
+
+        return extracted
+
     def _update_events_with_screenshots(
         self, 
         events: List[VideoEvent], 
-        screenshot_results: Dict[int, Optional[str]]
+        extraction_tasks: Dict[int, Tuple[float, Path, List[int]]],
+        screenshot_results: Dict[int, Union[str, bytes, None]]
     ) -> None:
-        """Update event objects with screenshot paths."""
-        for event in events:
-            if event.timestamp_ms in screenshot_results:
-                screenshot_path = screenshot_results[event.timestamp_ms]
-                if screenshot_path:
-                    # Store relative path from screenshots directory
-                    event.screenshot_path = f"{self.config.screenshot_subdir}/{screenshot_path}"
+        """
+        Update event objects with screenshot paths (or bytes).
+
+        Only successful screenshots are visited. Events whose timestamps were
+        merged into an earlier one by deduplication share that timestamp's
+        screenshot instead of going without one.
+        """
+        for timestamp_ms, screenshot in screenshot_results.items():
+            if not screenshot:
+                continue
+            event_indices = extraction_tasks[timestamp_ms][2]
+            if self.config.return_bytes:
+                for i in event_indices:
+                    events[i].screenshot_bytes = screenshot
+                continue
+            # Store relative path from screenshots directory
+            relative_path = f"{self.config.screenshot_subdir}/{screenshot}"
+            for i in event_indices:
+                events[i].screenshot_path = relative_path
 